@@ -1,15 +1,27 @@
+import time
+_import_start = time.perf_counter()
+
 from flask import Flask
 from datetime import timedelta
 from dotenv import load_dotenv
 from flask_cors import CORS
-from flask_sqlalchemy import SQLAlchemy
 from werkzeug.middleware.proxy_fix import ProxyFix
 from extensions import db, limiter
 from error.error_handlers import register_error_handlers
+from routes.health import register_health_routes
+from routes.leaderboard import register_leaderboard_routes
 from routes.solo import register_routes
+from commands import register_commands
+from db_pool import engine_options_from_env
+from json_provider import json_provider_from_config
+from limiter_storage import limiter_config_from_env
+from replay_executor import init_replay_executor
 import os
 
+IMPORT_SECONDS = time.perf_counter() - _import_start
+
 def create_app(config=None):
+    config_start = time.perf_counter()
     load_dotenv()
 
     app = Flask(__name__)
@@ -23,28 +35,90 @@ def create_app(config=None):
         PERMANENT_SESSION_LIFETIME=timedelta(days=365 * 2),
         SQLALCHEMY_DATABASE_URI=os.getenv("DATABASE_URL"),
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        CLEANUP_BATCH_SIZE=int(os.getenv("CLEANUP_BATCH_SIZE", "1000")),
+        CLEANUP_BATCH_PAUSE_SECONDS=float(os.getenv("CLEANUP_BATCH_PAUSE_SECONDS", "0.1")),
+        SCHEDULER_ENABLED=os.getenv("SCHEDULER_ENABLED", "true").lower() in {"1", "true", "yes"},
+        SCHEDULER_LOCK_FILE=os.getenv("SCHEDULER_LOCK_FILE"),
+        **limiter_config_from_env(),
+        READINESS_CACHE_SECONDS=float(os.getenv("READINESS_CACHE_SECONDS", "5")),
+        METRICS_ENABLED=os.getenv("METRICS_ENABLED", "true").lower() in {"1", "true", "yes"},
+        METRICS_TOKEN=os.getenv("METRICS_TOKEN"),
+        METRICS_PUBLIC=os.getenv("METRICS_PUBLIC", "false").lower() in {"1", "true", "yes"},
+        SLOW_REQUEST_MS=float(os.getenv("SLOW_REQUEST_MS", "500")),
+        SLOW_REQUEST_LOG=os.getenv("SLOW_REQUEST_LOG"),
+        REPLAY_CACHE_SIZE=int(os.getenv("REPLAY_CACHE_SIZE", "4096")),
+        IDEMPOTENCY_TTL_SECONDS=int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+        OPENING_POOL_SIZE=int(os.getenv("OPENING_POOL_SIZE", "64")),
+        OPENING_CACHE_SIZE=int(os.getenv("OPENING_CACHE_SIZE", "10000")),
+        REPLAY_WORKERS=int(os.getenv("REPLAY_WORKERS", "0")),
+        STATS_CACHE_SIZE=int(os.getenv("STATS_CACHE_SIZE", "10000")),
+        STATS_CACHE_SECONDS=float(os.getenv("STATS_CACHE_SECONDS", "5")),
+        JSON_PROVIDER=os.getenv("JSON_PROVIDER", "orjson"),
+        MAX_CONTENT_LENGTH=int(os.getenv("MAX_CONTENT_LENGTH", str(1024 * 1024))),
+        MAX_REPLAY_MOVES=int(os.getenv("MAX_REPLAY_MOVES", "100000")),
+        LEADERBOARD_REFRESH_SECONDS=int(os.getenv("LEADERBOARD_REFRESH_SECONDS", "300")),
+        LEADERBOARD_MIN_GAMES=int(os.getenv("LEADERBOARD_MIN_GAMES", "10")),
+        GAME_RECORD_BATCH_SIZE=int(os.getenv("GAME_RECORD_BATCH_SIZE", "500")),
+        GAME_RECORD_FLUSH_SECONDS=float(os.getenv("GAME_RECORD_FLUSH_SECONDS", "2")),
+        GAME_RECORD_MAX_PENDING=int(os.getenv("GAME_RECORD_MAX_PENDING", "10000")),
+        GAME_RECORD_RETENTION_DAYS=int(os.getenv("GAME_RECORD_RETENTION_DAYS", "90")),
     )
 
     if config:
         app.config.update(config)
 
+    app.json = json_provider_from_config(app)
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        engine_options_from_env(app.config["SQLALCHEMY_DATABASE_URI"]),
+    )
+
     CORS(app, supports_credentials=True, origins=[os.getenv("FRONTEND_URL")])
 
+    # No DDL here: the schema is created by `flask init-db`, not on every boot
+    db_start = time.perf_counter()
     db.init_app(app)
-    with app.app_context():
-        db.create_all()
 
+    routes_start = time.perf_counter()
     register_error_handlers(app, db)
+    register_commands(app, db)
+
+    if app.config["METRICS_ENABLED"]:
+        # Registered before the limiter and session hooks so request timing
+        # covers them, including requests the limiter rejects
+        from metrics import init_metrics
 
-    import routes.solo
-    from background import start_scheduler
+        init_metrics(app)
 
     if not app.config.get("TESTING"):
+        from background import start_scheduler
+
+        if app.config["RATELIMIT_STORAGE_URI"].startswith("memory://"):
+            app.logger.warning(
+                "Rate limits use per-process memory; each worker enforces its own counters. "
+                "Set RATELIMIT_STORAGE_URI to a sqlite:// or redis:// URI to share them."
+            )
         limiter.init_app(app)
         start_scheduler(app, db)
     
+    if app.config["SLOW_REQUEST_MS"] > 0:
+        from slow_log import init_slow_log
+
+        init_slow_log(app)
+
+    init_replay_executor(app)
+    register_health_routes(app, db, limiter)
     register_routes(app, db, limiter)
+    register_leaderboard_routes(app, db)
+    if not app.config.get("TESTING"):
+        # Tests flush game records explicitly instead of from a thread
+        app.extensions["game_recorder"].start()
 
+    done = time.perf_counter()
+    app.logger.info(
+        f"Startup: imports {IMPORT_SECONDS * 1000:.1f} ms, config {(db_start - config_start) * 1000:.1f} ms, "
+        f"db init {(routes_start - db_start) * 1000:.1f} ms, routes {(done - routes_start) * 1000:.1f} ms"
+    )
     return app
 
 if __name__ == '__main__':
@@ -1,27 +1,312 @@
 import atexit
-from apscheduler.schedulers.background import BackgroundScheduler
+import os
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import IntegrityError
+from leaderboard import leaderboards_refreshed_within, refresh_leaderboards
+from metrics import record_job
+from models.game_record import GameRecord
+from models.idempotency_key import IdempotencyKey
+from models.job_run import JobRun
+from models.seen_seed import SeenSeed
 from models.user import User
 
-def cleanup_expired_sessions(app, db):
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, assume a single serving process
+    fcntl = None
+
+# Arbitrary application-wide keys for pg_try_advisory_lock
+CLEANUP_ADVISORY_LOCK_KEY = 6702600
+SCHEDULER_LEADER_LOCK_KEY = 6702601
+DEFAULT_LOCK_FILE = os.path.join(tempfile.gettempdir(), "arithmetic-merge-cleanup.lock")
+CLEANUP_INTERVAL_SECONDS = 24 * 3600
+# A run is a duplicate if the previous one started within this share of the
+# interval; the margin absorbs scheduler jitter between consecutive runs
+JOB_RUN_MIN_GAP = 0.9
+
+def cleanup_expired_sessions(app, db) -> dict:
     with app.app_context():
         # 1. Calculate the cutoff in Python
         # Use a fixed 'now' and subtract the delta
         cutoff = datetime.now() - timedelta(days=365*2)
-        
-        # 2. Use a simple comparison in the filter
-        expired_count = User.query.filter(User.created_at < cutoff).delete()
-        
+        batch_size = app.config.get("CLEANUP_BATCH_SIZE", 1000)
+        batch_pause = app.config.get("CLEANUP_BATCH_PAUSE_SECONDS", 0.1)
+
+        # 2. Delete in bounded primary-key chunks so a large backlog never
+        # holds locks on a big part of the table in a single statement.
+        # The created_at index keeps each id lookup cheap.
+        stats = {"deleted": 0, "batches": 0, "max_batch_seconds": 0.0}
+        while True:
+            batch_start = time.perf_counter()
+            try:
+                expired_ids = [
+                    row.user_id
+                    for row in db.session.query(User.user_id)
+                    .filter(User.created_at < cutoff)
+                    .order_by(User.created_at)
+                    .limit(batch_size)
+                ]
+                if not expired_ids:
+                    break
+
+                deleted = User.query.filter(User.user_id.in_(expired_ids)).delete(synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Cleanup failed after {stats['deleted']} rows: {e}")
+                break
+
+            batch_seconds = time.perf_counter() - batch_start
+            stats["deleted"] += deleted
+            stats["batches"] += 1
+            stats["max_batch_seconds"] = max(stats["max_batch_seconds"], batch_seconds)
+            app.logger.info(
+                f"Cleanup batch {stats['batches']}: removed {deleted} expired sessions "
+                f"in {batch_seconds * 1000:.1f} ms ({stats['deleted']} total)"
+            )
+
+            if len(expired_ids) < batch_size:
+                break
+            time.sleep(batch_pause)
+
+        if stats["deleted"] > 0:
+            app.logger.info(
+                f"Removed {stats['deleted']} expired sessions in {stats['batches']} batches "
+                f"(slowest batch {stats['max_batch_seconds'] * 1000:.1f} ms)"
+            )
+        return stats
+
+def delete_older_than(app, db, pk_column, created_column, cutoff) -> int:
+    """Delete rows created before cutoff in CLEANUP_BATCH_SIZE primary-key chunks."""
+    batch_size = app.config.get("CLEANUP_BATCH_SIZE", 1000)
+    batch_pause = app.config.get("CLEANUP_BATCH_PAUSE_SECONDS", 0.1)
+    deleted = 0
+    while True:
+        expired = [
+            row[0]
+            for row in db.session.query(pk_column)
+            .filter(created_column < cutoff)
+            .order_by(created_column)
+            .limit(batch_size)
+        ]
+        if not expired:
+            return deleted
+        deleted += db.session.query(pk_column.class_).filter(pk_column.in_(expired)).delete(synchronize_session=False)
+        db.session.commit()
+        if len(expired) < batch_size:
+            return deleted
+        time.sleep(batch_pause)
+
+def cleanup_rows_older_than(app, db, label: str, pk_column, created_column, cutoff) -> int:
+    with app.app_context():
         try:
-            db.session.commit()
-            if expired_count > 0:
-                app.logger.info(f"Removed {expired_count} expired sessions")
+            deleted = delete_older_than(app, db, pk_column, created_column, cutoff)
         except Exception as e:
             db.session.rollback()
-            app.logger.error(f"Cleanup failed: {e}")
+            app.logger.error(f"Cleanup of expired {label} failed: {e}")
+            return 0
+        if deleted > 0:
+            app.logger.info(f"Removed {deleted} expired {label}")
+        return deleted
+
+def cleanup_expired_idempotency_keys(app, db) -> int:
+    ttl = app.config.get("IDEMPOTENCY_TTL_SECONDS", 86400)
+    cutoff = datetime.now() - timedelta(seconds=max(ttl, 0))
+    return cleanup_rows_older_than(
+        app, db, "idempotency keys", IdempotencyKey.key, IdempotencyKey.created_at, cutoff
+    )
+
+def cleanup_expired_seen_seeds(app, db) -> int:
+    # Kept as long as the session that played them
+    cutoff = datetime.now() - timedelta(days=365*2)
+    return cleanup_rows_older_than(app, db, "seen seeds", SeenSeed.id, SeenSeed.created_at, cutoff)
+
+def cleanup_expired_game_records(app, db) -> int:
+    retention_days = app.config.get("GAME_RECORD_RETENTION_DAYS", 90)
+    if retention_days <= 0:  # keep forever
+        return 0
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    return cleanup_rows_older_than(app, db, "game records", GameRecord.id, GameRecord.created_at, cutoff)
+
+@contextmanager
+def job_lock(app, db):
+    """Yield True if this process won the job lock, False if another holds it.
+
+    Held only while a job runs, so a CLI run never overlaps the scheduler's.
+    PostgreSQL deployments use a session-level advisory lock so the lock spans
+    every worker on every host; other databases fall back to an flock on
+    SCHEDULER_LOCK_FILE, which covers workers sharing one machine.
+    """
+    if db.engine.dialect.name == "postgresql":
+        with db.engine.connect() as conn:
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": CLEANUP_ADVISORY_LOCK_KEY}
+            ).scalar()
+            # Don't sit idle in a transaction while the job runs (minutes, with
+            # batch pauses); the session-level lock outlives the commit
+            conn.commit()
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": CLEANUP_ADVISORY_LOCK_KEY})
+                    conn.commit()
+        return
+
+    if fcntl is None:
+        yield True
+        return
+
+    lock_path = app.config.get("SCHEDULER_LOCK_FILE") or DEFAULT_LOCK_FILE
+    with open(lock_path, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def elect_scheduler_leader(app, db):
+    """Try once to become the process that runs the scheduler.
+
+    Returns a handle holding the leader lock for the rest of the process's
+    life (the flock'd file, or on PostgreSQL the dedicated connection holding
+    the advisory lock), or None if another process already leads. The lock is
+    released when the leader exits, so the worker gunicorn starts in its place
+    takes over.
+    """
+    if db.engine.dialect.name == "postgresql":
+        conn = db.engine.connect()
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": SCHEDULER_LEADER_LOCK_KEY}
+        ).scalar()
+        # Session-level advisory locks outlive the transaction; don't sit idle in one
+        conn.commit()
+        if not acquired:
+            conn.close()
+            return None
+        return conn
+
+    if fcntl is None:
+        return True
+
+    lock_path = (app.config.get("SCHEDULER_LOCK_FILE") or DEFAULT_LOCK_FILE) + ".leader"
+    lock_file = open(lock_path, "a")
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+def claim_job_run(db, name: str, interval_seconds: float) -> bool:
+    """Record that job name starts now, unless it already started within the interval.
+
+    The conditional UPDATE is atomic, so of several processes racing for the
+    same run exactly one gets True.
+    """
+    now = datetime.now()
+    threshold = now - timedelta(seconds=interval_seconds * JOB_RUN_MIN_GAP)
+    claimed = db.session.execute(
+        update(JobRun)
+        .where(JobRun.name == name, JobRun.last_run_at <= threshold)
+        .values(last_run_at=now)
+    ).rowcount
+    if claimed:
+        db.session.commit()
+        return True
+    if db.session.scalar(select(JobRun.name).where(JobRun.name == name)) is not None:
+        db.session.rollback()
+        return False
+    db.session.add(JobRun(name=name, last_run_at=now))
+    try:
+        db.session.commit()
+    except IntegrityError:  # another process recorded the first run
+        db.session.rollback()
+        return False
+    return True
+
+def run_cleanup_job(app, db, force: bool = False) -> dict | None:
+    """Run the cleanup tasks unless another process is running them or ran them
+    within the last CLEANUP_INTERVAL_SECONDS (force skips the interval check)."""
+    with app.app_context():
+        with job_lock(app, db) as acquired:
+            if not acquired:
+                app.logger.info("Skipping session cleanup: another process holds the lock")
+                return None
+            if not claim_job_run(db, "cleanup", 0 if force else CLEANUP_INTERVAL_SECONDS):
+                app.logger.info("Skipping session cleanup: it already ran within the interval")
+                return None
+            start = time.perf_counter()
+            stats = cleanup_expired_sessions(app, db)
+            record_job("cleanup_expired_sessions", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            stats["idempotency_keys_deleted"] = cleanup_expired_idempotency_keys(app, db)
+            record_job("cleanup_expired_idempotency_keys", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            stats["seen_seeds_deleted"] = cleanup_expired_seen_seeds(app, db)
+            record_job("cleanup_expired_seen_seeds", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            stats["game_records_deleted"] = cleanup_expired_game_records(app, db)
+            record_job("cleanup_expired_game_records", time.perf_counter() - start)
+            return stats
+
+def run_leaderboard_job(app, db, force: bool = False) -> dict[str, int] | None:
+    """Rebuild the leaderboards unless another process is running a scheduled
+    job or the boards were rebuilt within LEADERBOARD_REFRESH_SECONDS (force
+    skips the interval check)."""
+    interval = app.config.get("LEADERBOARD_REFRESH_SECONDS", 300)
+    with app.app_context():
+        with job_lock(app, db) as acquired:
+            if not acquired:
+                app.logger.info("Skipping leaderboard refresh: another process holds the lock")
+                return None
+            if not force and leaderboards_refreshed_within(db, interval * JOB_RUN_MIN_GAP):
+                app.logger.info("Skipping leaderboard refresh: rebuilt within the interval")
+                return None
+            return refresh_leaderboards(app, db)
 
 def start_scheduler(app, db) -> None:
+    if not app.config.get("SCHEDULER_ENABLED", True):
+        app.logger.info("In-process scheduler disabled; run `flask cleanup-sessions` externally")
+        return
+
+    # Only one process per deployment runs the scheduled jobs
+    with app.app_context():
+        leadership = elect_scheduler_leader(app, db)
+    if leadership is None:
+        app.logger.info("Another worker leads the scheduler; not starting it here")
+        return
+    app.extensions["scheduler_leader"] = leadership
+
+    # Imported here so processes that never schedule (tests, CLI) skip APScheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
+
     scheduler = BackgroundScheduler()
-    scheduler.add_job(func=lambda: cleanup_expired_sessions(app, db), trigger="interval", hours=24) # daily
+    scheduler.add_job(
+        func=lambda: run_cleanup_job(app, db),
+        trigger="interval",
+        seconds=CLEANUP_INTERVAL_SECONDS,
+        # Also at startup, so restarts more frequent than daily don't starve it;
+        # claim_job_run skips the run if it already happened within the interval
+        next_run_time=datetime.now(),
+    )
+    scheduler.add_job(
+        func=lambda: run_leaderboard_job(app, db),
+        trigger="interval",
+        seconds=app.config.get("LEADERBOARD_REFRESH_SECONDS", 300),
+        # Also at startup, which only rebuilds if the boards are missing or stale
+        next_run_time=datetime.now(),
+    )
     scheduler.start()
     atexit.register(lambda: scheduler.shutdown(wait=False))
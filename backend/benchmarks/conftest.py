@@ -0,0 +1,66 @@
+import sys
+import os
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Ensure backend/ is on the path so all backend imports resolve correctly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tests.conftest import WON_GAME_1, LOST_GAME_1
+from utils.game import DeterministicRNG, construct_grid, SPACE
+from utils.replay import NUM_ROWS, NUM_COLS, apply_move, construct_game
+
+SYNTHETIC_MOVES = 5000
+ROTATION = ["up", "left", "down", "right"]
+
+
+def replay_to(replay, num_moves):
+    """Return the Game reached after the first num_moves of a replay."""
+    game = construct_game(construct_grid(NUM_ROWS, NUM_COLS, SPACE), DeterministicRNG(replay["seed"]))
+    game.generate_tiles()
+    for move in replay["moves"][:num_moves]:
+        apply_move(game, move)
+        game.generate_tiles()
+    return game
+
+
+def build_long_replay(num_moves):
+    """Find a seed whose rotation-policy game stays in progress for num_moves moves."""
+    for attempt in range(100):
+        seed = f"bench-{attempt}"
+        game = construct_game(construct_grid(NUM_ROWS, NUM_COLS, SPACE), DeterministicRNG(seed))
+        game.generate_tiles()
+        moves = []
+        while len(moves) < num_moves and game.get_state() == "In Progress":
+            valid = game.get_valid_moves()
+            move = ROTATION[len(moves) % len(ROTATION)]
+            if move not in valid:
+                move = valid[0]
+            apply_move(game, move)
+            game.generate_tiles()
+            moves.append(move)
+        if len(moves) == num_moves and game.get_state() == "In Progress":
+            return {"seed": seed, "moves": moves}
+    raise RuntimeError(f"No seed kept a game in progress for {num_moves} moves")
+
+
+@pytest.fixture(scope="session")
+def won_replay():
+    return WON_GAME_1
+
+
+@pytest.fixture(scope="session")
+def lost_replay():
+    return LOST_GAME_1
+
+
+@pytest.fixture(scope="session")
+def long_replay():
+    return build_long_replay(SYNTHETIC_MOVES)
+
+
+@pytest.fixture
+def midgame(won_replay):
+    """A busy board from the middle of a real game."""
+    return replay_to(won_replay, len(won_replay["moves"]) // 2)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark.
+
+Runs `python -X importtime` in a fresh interpreter for each target and reports
+the total cumulative import time plus the slowest top-level packages.
+
+    cd backend
+    python benchmarks/importtime.py            # wsgi app + pure game engine
+    python benchmarks/importtime.py --runs 10  # median over more runs
+    python benchmarks/importtime.py engine     # only the Flask-free engine
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "wsgi": "wsgi",
+    "engine": "utils.replay",
+}
+
+
+def run_importtime(statement: str) -> list[tuple[int, str, int]]:
+    """Return (depth, module, cumulative microseconds) rows for one cold import."""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    env.setdefault("SECRET_KEY", "benchmark")
+    env.setdefault("FRONTEND_URL", "http://localhost:3000")
+    env["SCHEDULER_ENABLED"] = "false"
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # importtime indents nested imports by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, name.strip(), int(cumulative_us)))
+    return rows
+
+
+def summarize(rows, module: str, max_depth: int) -> tuple[int, list[tuple[str, int]]]:
+    """Return the module's cumulative time and the cost of its imports down to max_depth."""
+    # Children are logged before their parent, so walk backwards from the parent
+    for index, (depth, name, cumulative_us) in enumerate(rows):
+        if depth == 0 and name == module:
+            break
+    else:
+        raise ValueError(f"{module} not found in importtime output")
+
+    children = []
+    for child_depth, child_name, child_us in reversed(rows[:index]):
+        if child_depth == 0:
+            break
+        if child_depth <= max_depth:
+            children.append((child_name, child_us))
+    return cumulative_us, children
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=2, help="nesting depth of imports to list")
+    parser.add_argument("targets", nargs="*", default=list(TARGETS))
+    args = parser.parse_args()
+
+    for target in args.targets:
+        module = TARGETS[target]
+        runs = [summarize(run_importtime(f"import {module}"), module, args.depth) for _ in range(args.runs)]
+        totals = [total for total, _ in runs]
+        print(f"{target} ({module}): median {statistics.median(totals) / 1000:.1f} ms "
+              f"(min {min(totals) / 1000:.1f} ms, {args.runs} runs)")
+
+        slowest = sorted(runs[-1][1], key=lambda item: item[1], reverse=True)[:args.top]
+        for name, cumulative_us in slowest:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
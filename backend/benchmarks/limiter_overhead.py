@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Per-request rate limiter overhead by storage backend.
+
+Each request to a limited route costs one fixed-window hit against the
+limiter storage; this times that hit in isolation.
+
+    cd backend
+    python benchmarks/limiter_overhead.py
+    python benchmarks/limiter_overhead.py --redis redis://localhost:6379
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+import limiter_storage  # registers the sqlite:// scheme
+
+LIMIT = parse("1000000 per hour")  # high enough that no hit is rejected
+
+
+def time_hits(storage_uri: str, num_hits: int, num_keys: int) -> list[float]:
+    storage = storage_from_string(storage_uri)
+    strategy = FixedWindowRateLimiter(storage)
+    storage.reset()
+
+    samples = []
+    for i in range(num_hits):
+        key = f"user-{i % num_keys}"
+        start = time.perf_counter()
+        strategy.hit(LIMIT, key)
+        samples.append(time.perf_counter() - start)
+    storage.reset()
+    return samples
+
+
+def report(name: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    pct = lambda p: samples[min(len(samples) - 1, int(len(samples) * p))] * 1e6
+    print(f"{name:<8} mean {statistics.fmean(samples) * 1e6:8.1f} us   "
+          f"p50 {pct(0.50):8.1f} us   p99 {pct(0.99):8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--redis", help="also benchmark this Redis URI")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=limiter_storage.DEFAULT_SHARED_DIR) as tmp:
+        backends = {
+            "memory": "memory://",
+            "sqlite": f"sqlite:///{os.path.join(tmp, 'limits.db')}",
+        }
+        if args.redis:
+            backends["redis"] = args.redis
+
+        for name, uri in backends.items():
+            report(name, time_hits(uri, args.hits, args.keys))
+
+
+if __name__ == "__main__":
+    main()
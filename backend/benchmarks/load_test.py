@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+End-to-end HTTP load test.
+
+Starts create_app() on a local threaded server (or targets --url), then runs
+--users virtual players in parallel for --duration seconds. Each player keeps
+its own session cookie and loops over GET /api/statistics, POST /api/verify
+(lost games) and POST /api/restart (in-progress games). Every submission is a
+new game on a seed no one has played, built with tests/conftest.py's
+build_replay, so the server replays each one instead of answering from the
+seen-seed, replay-cache or idempotency fast paths. Prints throughput and
+p50/p95/p99 latency per route.
+
+    cd backend
+    python benchmarks/load_test.py                                # SQLite, limiter off
+    python benchmarks/load_test.py --limiter sqlite --users 32
+    python benchmarks/load_test.py --database-url postgresql://localhost/arith_load \\
+        --limiter redis://localhost:6379
+    python benchmarks/load_test.py --url http://localhost:5000    # an already running server
+"""
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.conftest import build_replay
+
+
+def build_game(job: tuple[str, str, int]) -> dict | None:
+    """A finished game for verify or an in-progress one for restart; None if
+    the seed's game can't reach the wanted state."""
+    kind, seed, index = job
+    if kind == "restart":
+        return build_replay(seed, exact_moves=20 + index % 20)
+    try:
+        return build_replay(seed, target_state="Lost")
+    except RuntimeError:
+        return None
+
+
+class ReplaySource:
+    """Hands out every replay once, each on a fresh seed.
+
+    A resubmitted seed is answered as "already submitted" without a replay,
+    so reusing games would measure that shortcut instead of verification.
+    Games are built before the clock starts, in parallel; if a run outlasts
+    them, more are built on demand and counted in built_during_run, since in
+    local mode that competes with the server for CPU.
+    """
+    def __init__(self, games_per_kind: int) -> None:
+        # Unique per run, so a long-running --url server's replay cache has never seen them
+        self._prefix = f"load-{uuid.uuid4().hex[:8]}"
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.built_during_run = 0
+        jobs = [self._job(kind) for kind in ("verify", "restart") for _ in range(games_per_kind)]
+        with ProcessPoolExecutor() as pool:
+            games = list(pool.map(build_game, jobs, chunksize=16))
+        self._games = {kind: deque() for kind in ("verify", "restart")}
+        for (kind, _, _), game in zip(jobs, games):
+            if game is not None:
+                self._games[kind].append(game)
+
+    def _job(self, kind: str) -> tuple[str, str, int]:
+        with self._lock:
+            index = next(self._counter)
+        return kind, f"{self._prefix}-{index}", index
+
+    def next(self, kind: str) -> dict:
+        try:
+            return self._games[kind].popleft()
+        except IndexError:
+            pass
+        with self._lock:
+            self.built_during_run += 1
+        while True:
+            game = build_game(self._job(kind))
+            if game is not None:
+                return game
+
+
+def start_local_server(database_url: str, limiter: str) -> tuple[str, object]:
+    from werkzeug.serving import make_server
+    from app import create_app
+    from extensions import db
+
+    config = {
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "SECRET_KEY": "load-test",
+        "SCHEDULER_ENABLED": False,
+        "SLOW_REQUEST_MS": 0,
+        "RATELIMIT_ENABLED": limiter != "off",
+    }
+    if limiter == "sqlite":
+        config["RATELIMIT_STORAGE_URI"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'limits.db')}"
+    elif limiter != "off":
+        config["RATELIMIT_STORAGE_URI"] = limiter
+
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+class Player:
+    """One virtual user: a keep-alive connection plus its session cookie."""
+    def __init__(self, base_url: str) -> None:
+        parts = urlsplit(base_url)
+        conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.conn = conn_class(parts.hostname, parts.port, timeout=30)
+        self.cookie = None
+
+    def request(self, method: str, path: str, body: dict | None = None) -> int:
+        headers = {"Content-Type": "application/json"}
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        payload = json.dumps(body) if body is not None else None
+        self.conn.request(method, path, body=payload, headers=headers)
+        response = self.conn.getresponse()
+        response.read()
+        set_cookie = response.getheader("Set-Cookie")
+        if set_cookie:
+            self.cookie = set_cookie.split(";", 1)[0]
+        return response.status
+
+
+def run_player(base_url, replays: ReplaySource, deadline, index, results, lock) -> None:
+    player = Player(base_url)
+    samples = []
+    step = index
+    while time.perf_counter() < deadline:
+        kind = step % 3
+        if kind == 0:
+            route, method, body = "/api/statistics", "GET", None
+        elif kind == 1:
+            route, method, body = "/api/verify", "POST", replays.next("verify")
+        else:
+            route, method, body = "/api/restart", "POST", replays.next("restart")
+        step += 1
+
+        start = time.perf_counter()
+        try:
+            status = player.request(method, route, body)
+        except (OSError, http.client.HTTPException):
+            status = 0
+            player = Player(base_url)
+        samples.append((route, status, time.perf_counter() - start))
+
+    with lock:
+        results.extend(samples)
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def report(results, elapsed: float) -> None:
+    print(f"{'route':<18}{'requests':>10}{'rps':>9}{'errors':>8}{'429s':>7}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    routes = sorted({route for route, _, _ in results}) + ["all"]
+    for route in routes:
+        rows = [r for r in results if route == "all" or r[0] == route]
+        latencies = sorted(seconds * 1000 for _, _, seconds in rows)
+        errors = sum(1 for _, status, _ in rows if status == 0 or status >= 500)
+        limited = sum(1 for _, status, _ in rows if status == 429)
+        print(f"{route:<18}{len(rows):>10}{len(rows) / elapsed:>9.1f}{errors:>8}{limited:>7}"
+              f"{percentile(latencies, 0.50):>9.1f}{percentile(latencies, 0.95):>9.1f}"
+              f"{percentile(latencies, 0.99):>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8, help="concurrent virtual players")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--database-url", help="database for the local server (default: temp SQLite file)")
+    parser.add_argument("--limiter", default="off",
+                        help="off, memory://, sqlite (temp file) or a redis:// URI")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="verify and restart games each to build before the run")
+    args = parser.parse_args()
+
+    build_start = time.perf_counter()
+    replays = ReplaySource(args.games)
+    print(f"Built {2 * args.games} games in {time.perf_counter() - build_start:.1f} s", file=sys.stderr)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}"
+        base_url, server = start_local_server(database_url, args.limiter)
+
+    results = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    players = [
+        threading.Thread(target=run_player, args=(base_url, replays, deadline, i, results, lock))
+        for i in range(args.users)
+    ]
+    for player in players:
+        player.start()
+    for player in players:
+        player.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.users} users, {elapsed:.1f} s against {base_url} (limiter: {args.limiter})")
+    report(results, elapsed)
+    if replays.built_during_run:
+        print(f"Warning: {replays.built_during_run} games were built during the run; "
+              f"raise --games so building doesn't compete with the server", file=sys.stderr)
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
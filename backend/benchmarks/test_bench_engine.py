@@ -0,0 +1,70 @@
+"""Benchmarks for the game engine and replay hot paths.
+
+Run from backend/benchmarks/ (requires pytest-benchmark); pytest.ini there
+compares each run with the committed baseline and fails on a >10% regression:
+
+    pytest
+"""
+import pytest
+
+from utils.game import ADDITION, SUBTRACTION, SPACE, DeterministicRNG, collapse_list_left, collapse_list_right
+from utils.replay import simulate_game
+
+# A full row with every collapse rule in play: operator runs, chains, leftovers
+BUSY_ROW = [1, ADDITION, 2, ADDITION, ADDITION, 3, SUBTRACTION, 4]
+
+
+@pytest.mark.parametrize("collapse", [collapse_list_left, collapse_list_right], ids=["left", "right"])
+def test_collapse_list(benchmark, collapse):
+    result = benchmark(collapse, BUSY_ROW)
+    assert SPACE not in result
+
+
+@pytest.mark.parametrize("direction", ["up", "down", "left", "right"])
+def test_game_direction(benchmark, midgame, direction):
+    grid = benchmark(getattr(midgame, direction))
+    assert len(grid) == midgame.get_num_rows()
+
+
+def test_get_valid_moves(benchmark, midgame):
+    benchmark(midgame.get_valid_moves)
+
+
+def test_generate_tiles(benchmark, midgame):
+    grid = [row[:] for row in midgame.get_game()]
+
+    def fresh_game():
+        game = type(midgame)(
+            [row[:] for row in grid],
+            DeterministicRNG("bench"),
+            midgame.get_num_rows(),
+            midgame.get_num_cols(),
+            midgame.get_generated_operations(),
+            midgame.get_prob_operations(),
+            midgame.get_generated_digits(),
+            midgame.get_num_generated_tiles_per_turn(),
+        )
+        game.update_blank_spaces()
+        return (game,), {}
+
+    benchmark.pedantic(lambda game: game.generate_tiles(), setup=fresh_game, rounds=2000)
+
+
+def test_rng_sample(benchmark):
+    rng = DeterministicRNG("bench")
+    assert len(benchmark(rng.sample, range(42), 2)) == 2
+
+
+def test_simulate_won_game(benchmark, won_replay):
+    assert benchmark(simulate_game, won_replay["seed"], won_replay["moves"]) == (True, "Won")
+
+
+def test_simulate_lost_game(benchmark, lost_replay):
+    assert benchmark(simulate_game, lost_replay["seed"], lost_replay["moves"]) == (True, "Lost")
+
+
+def test_simulate_synthetic_5k_moves(benchmark, long_replay):
+    result = benchmark.pedantic(
+        simulate_game, args=(long_replay["seed"], long_replay["moves"]), rounds=3, iterations=1
+    )
+    assert result == (True, "In Progress")
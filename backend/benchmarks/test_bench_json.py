@@ -0,0 +1,59 @@
+"""Benchmarks for JSON parsing and encoding of API payloads, per provider.
+
+Run from backend/benchmarks/ (requires pytest-benchmark):
+
+    pytest test_bench_json.py
+"""
+import json
+import pytest
+
+from app import create_app
+from routes.request_body import get_request_json
+
+PROVIDERS = ["stdlib", "orjson"]
+
+
+@pytest.fixture(scope="module", params=PROVIDERS)
+def app(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    return create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SECRET_KEY": "bench",
+        "JSON_PROVIDER": request.param,
+    })
+
+
+@pytest.fixture(scope="module")
+def long_body(long_replay):
+    return json.dumps(long_replay).encode()
+
+
+def test_loads_5k_move_replay(benchmark, app, long_body):
+    assert len(benchmark(app.json.loads, long_body)["moves"]) == 5000
+
+
+def test_get_request_json_5k_moves(benchmark, app, long_body):
+    def parse():
+        with app.test_request_context("/api/verify", method="POST", data=long_body, content_type="application/json"):
+            return get_request_json()
+
+    assert len(benchmark(parse)["moves"]) == 5000
+
+
+def test_get_request_json_streamed_50k_moves(benchmark, app):
+    # Larger than one chunk, so parsed from the stream
+    body = json.dumps({"seed": "bench", "moves": ["up", "left", "down", "right"] * 12500}).encode()
+
+    def parse():
+        with app.test_request_context("/api/verify", method="POST", data=body, content_type="application/json"):
+            return get_request_json()
+
+    assert len(benchmark(parse)["moves"]) == 50000
+
+
+def test_stats_response(benchmark, app):
+    payload = {"user_id": "0b6b3a4e-7f0e-4f6a-9a53-5c2a3e8d1f00", "wins": 12, "losses": 30, "abandoned": 4}
+    with app.app_context():
+        assert benchmark(app.json.response, payload).status_code == 200
@@ -0,0 +1,88 @@
+import os
+import time
+import click
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from background import run_cleanup_job, run_leaderboard_job
+from game_records import decode_moves, replay_matches
+from models.game_record import GameRecord
+from slow_log import read_slow_log
+from utils.replay import simulate_game
+
+def register_commands(app, db):
+    @app.cli.command("init-db")
+    def init_db_command():
+        """Create missing tables, columns and indexes; safe to re-run on every deploy."""
+        db.create_all()
+        # create_all skips existing tables, so add nullable columns introduced since
+        inspector = inspect(db.engine)
+        preparer = db.engine.dialect.identifier_preparer
+        for table in db.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+                    with db.engine.begin() as conn:
+                        conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}"))
+        # create_all skips existing tables, so add indexes introduced since
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
+        click.echo("Database schema is up to date")
+
+    @app.cli.command("cleanup-sessions")
+    @click.option("--force", is_flag=True, help="Run even if the cleanup already ran in the last 24 hours")
+    def cleanup_sessions_command(force):
+        """Delete expired sessions once, coordinating with any running workers."""
+        stats = run_cleanup_job(app, db, force=force)
+        if stats is None:
+            click.echo("Cleanup skipped: another process holds the cleanup lock or it ran in the last 24 hours")
+            return
+        click.echo(
+            f"Removed {stats['deleted']} expired sessions in {stats['batches']} batches, "
+            f"{stats['idempotency_keys_deleted']} expired idempotency keys, "
+            f"{stats['seen_seeds_deleted']} expired seen seeds "
+            f"and {stats['game_records_deleted']} expired game records"
+        )
+
+    @app.cli.command("refresh-leaderboards")
+    @click.option("--force", is_flag=True, help="Rebuild even if the leaderboards were rebuilt within LEADERBOARD_REFRESH_SECONDS")
+    def refresh_leaderboards_command(force):
+        """Rebuild every leaderboard once, e.g. from cron when the scheduler is disabled."""
+        totals = run_leaderboard_job(app, db, force=force)
+        if totals is None:
+            click.echo("Refresh skipped: another process holds the job lock or the leaderboards are up to date")
+            return
+        for board, total in totals.items():
+            click.echo(f"Ranked {total} players on the {board} leaderboard")
+
+    @app.cli.command("audit-games")
+    @click.option("--limit", default=1000, show_default=True, help="Most recent game records to replay")
+    def audit_games_command(limit):
+        """Replay recorded games and report any whose stored result no longer matches."""
+        records = GameRecord.query.order_by(GameRecord.id.desc()).limit(limit).all()
+        mismatches = 0
+        for record in records:
+            verified, state = simulate_game(record.seed, decode_moves(record.moves))
+            if not replay_matches(record.result, (verified, state)):
+                mismatches += 1
+                click.echo(f"Game {record.id} (user {record.user_id}): recorded {record.result}, replays as {verified}/{state}")
+        click.echo(f"Replayed {len(records)} games, {mismatches} mismatches")
+
+    @app.cli.command("replay-slow-log")
+    @click.argument("path", required=False)
+    def replay_slow_log_command(path):
+        """Re-run every captured replay in a slow-request log (all worker files) and time it locally."""
+        path = path or app.config.get("SLOW_REQUEST_LOG") or os.path.join(app.instance_path, "slow_requests.jsonl")
+        for entry in read_slow_log(path):
+            if "seed" not in entry:
+                continue
+            start = time.perf_counter()
+            verified, state = simulate_game(entry["seed"], entry["moves"])
+            seconds = time.perf_counter() - start
+            click.echo(
+                f"{entry['timestamp']} {entry['endpoint']} seed={entry['seed']} moves={entry['num_moves']} "
+                f"result={verified}/{state} simulate {seconds * 1000:.1f} ms "
+                f"(logged {entry['simulate_seconds'] * 1000:.1f} ms, total {entry['total_seconds'] * 1000:.1f} ms, "
+                f"db {entry['db_seconds'] * 1000:.1f} ms)"
+            )
@@ -0,0 +1,101 @@
+import logging
+import os
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+TRUTHY = {"1", "true", "yes"}
+
+
+class PoolMetrics:
+    """Per-worker connection pool counters, fed by TimedQueuePool."""
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pool = None
+        self._observers = []
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.slow_wait_seconds = float(os.getenv("DB_POOL_WAIT_WARN_MS", "100")) / 1000
+
+    def track(self, pool) -> None:
+        self._pool = pool
+
+    def add_observer(self, on_checkout, on_timeout) -> None:
+        """Also report each checkout wait (seconds) and each timeout to these callbacks."""
+        self._observers.append((on_checkout, on_timeout))
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        for on_checkout, _ in self._observers:
+            on_checkout(wait_seconds)
+        if wait_seconds >= self.slow_wait_seconds:
+            logger.warning(f"Waited {wait_seconds * 1000:.1f} ms for a DB connection ({self._pool.status()})")
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        for _, on_timeout in self._observers:
+            on_timeout()
+        logger.error(f"Timed out waiting for a DB connection ({self._pool.status()})")
+
+    def snapshot(self) -> dict:
+        pool = self._pool
+        with self._lock:
+            return {
+                "pool_size": pool.size() if pool else 0,
+                "checked_out": pool.checkedout() if pool else 0,
+                "overflow": pool.overflow() if pool else 0,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        pool_metrics.track(self)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start)
+        return conn
+
+
+def engine_options_from_env(database_uri: str | None) -> dict:
+    # SQLite (local dev and tests) keeps SQLAlchemy's own pool defaults
+    if not database_uri or database_uri.startswith("sqlite"):
+        return {}
+
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in TRUTHY,
+    }
+
+    statement_timeout_ms = os.getenv("DB_STATEMENT_TIMEOUT_MS")
+    if statement_timeout_ms and database_uri.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout_ms)}"}
+
+    return options
@@ -2,13 +2,14 @@ from flask import session
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_sqlalchemy import SQLAlchemy
-import os
-from dotenv import load_dotenv
+from metrics import record_rate_limit_rejection
+from routes.policy import is_rate_limited
 
-load_dotenv()
 db = SQLAlchemy()
 
-# Default rate limiting: rate limit by user_id, use IP as fallback
+# Default rate limiting: rate limit by user_id, use IP as fallback.
+# Storage is read from RATELIMIT_STORAGE_URI when limiter.init_app() runs, so
+# the storage backend is only imported for apps that enable rate limiting.
 def rate_limit_key():
     if session and "user_id" in session:
         return session["user_id"]
@@ -17,5 +18,10 @@ def rate_limit_key():
 limiter = Limiter(
     key_func=rate_limit_key,
     default_limits=["2 per second"],
-    storage_uri=os.getenv("REDIS_URL"),
+    on_breach=record_rate_limit_rejection,
 )
+
+# Routes whose policy opts out of rate limiting skip limiter storage entirely
+@limiter.request_filter
+def exempt_by_route_policy():
+    return not is_rate_limited()
@@ -0,0 +1,120 @@
+import atexit
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime
+from sqlalchemy import insert
+from metrics import record_job
+from models.game_record import GameRecord
+
+MOVE_CODES = {"u": "up", "d": "down", "l": "left", "r": "right"}
+RESULT_REPLAYS = {"Won": (True, "Won"), "Lost": (True, "Lost"), "Abandoned": (True, "In Progress")}
+
+
+def encode_moves(moves: list[str]) -> bytes:
+    # One letter per move, as in the parity corpus; zlib brings that to ~2-3 bits a move
+    return zlib.compress("".join(move[0] for move in moves).encode(), 9)
+
+
+def decode_moves(blob: bytes) -> list[str]:
+    return [MOVE_CODES[code] for code in zlib.decompress(blob).decode()]
+
+
+def replay_matches(result: str, replayed: tuple[bool, str | None]) -> bool:
+    """Whether a stored result agrees with a fresh simulate_game() of the record."""
+    if result in RESULT_REPLAYS:
+        return replayed == RESULT_REPLAYS[result]
+    # Invalid: anything but a finished game
+    return replayed not in (RESULT_REPLAYS["Won"], RESULT_REPLAYS["Lost"])
+
+
+class GameRecorder:
+    """Buffers GameRecord rows in memory and inserts them in batches.
+
+    record() only appends to a bounded queue, so /api/verify never waits on
+    the insert. A daemon thread, started on the first record() after start()
+    (i.e. after gunicorn forks), writes the queue in one multi-row INSERT
+    every flush_seconds, or sooner once batch_size rows are waiting. Rows
+    beyond max_pending are dropped, and anything still queued when the
+    process dies is lost: the history is for analysis, not for the stats.
+    """
+    def __init__(self, app, db, batch_size: int, flush_seconds: float, max_pending: int) -> None:
+        # Checked here, at startup, rather than failing every flush later
+        if batch_size < 1:
+            raise ValueError(f"GAME_RECORD_BATCH_SIZE must be at least 1, got {batch_size}")
+        self.app = app
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._background = False
+        self._thread = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Flush from a background thread; without this, only flush() writes."""
+        self._background = True
+        atexit.register(self.flush)
+
+    def record(self, user_id: str, seed: str, moves: list[str], result: str, verify_seconds: float) -> None:
+        if self.max_pending <= 0:
+            return
+        row = {
+            "user_id": user_id,
+            "seed": seed,
+            "result": result,
+            "num_moves": len(moves),
+            "moves": moves,  # compressed in flush(), off the request thread
+            "verify_ms": verify_seconds * 1000,
+            "created_at": datetime.now(),
+        }
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending.append(row)
+            pending = len(self._pending)
+            if self._background and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="game-recorder", daemon=True)
+                self._thread.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Insert every queued row; returns how many were written."""
+        with self._lock:
+            rows = list(self._pending)
+            self._pending.clear()
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            self.app.logger.warning(f"Dropped {dropped} game records: more than {self.max_pending} were waiting")
+        if not rows:
+            return 0
+
+        start = time.perf_counter()
+        for row in rows:
+            row["moves"] = encode_moves(row["moves"])
+        with self.app.app_context():
+            try:
+                for i in range(0, len(rows), self.batch_size):
+                    self.db.session.execute(insert(GameRecord), rows[i:i + self.batch_size])
+                self.db.session.commit()
+            except Exception as e:
+                self.db.session.rollback()
+                self.app.logger.error(f"Writing {len(rows)} game records failed: {e}")
+                return 0
+        record_job("flush_game_records", time.perf_counter() - start)
+        return len(rows)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def __len__(self) -> int:
+        return len(self._pending)
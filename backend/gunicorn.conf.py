@@ -0,0 +1,22 @@
+# Loaded automatically by gunicorn when started from backend/.
+# With PROMETHEUS_MULTIPROC_DIR set, each worker writes its metrics to files in
+# that directory and /metrics aggregates them; drop a worker's live gauges when it exits.
+import os
+
+# Requests mostly wait on the database and the rate-limit store, so each worker
+# serves several at once on threads; REPLAY_WORKERS moves replays off them.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+
+def worker_exit(server, worker):
+    import replay_executor
+
+    replay_executor.shutdown()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
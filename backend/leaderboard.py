@@ -0,0 +1,88 @@
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import Float, cast, delete, func, insert, literal, select
+from metrics import record_job
+from models.leaderboard import LeaderboardEntry, LeaderboardRefresh
+from models.user import User
+
+BOARDS = ("wins", "win_rate", "fastest_win")
+
+
+def board_query(board: str, min_games: int):
+    """(value, ordering, filter) over User for one board; rank 1 is the best."""
+    if board == "wins":
+        return User.num_wins, User.num_wins.desc(), User.num_wins > 0
+    if board == "win_rate":
+        games = User.num_wins + User.num_losses + User.num_abandoned_games
+        win_rate = cast(User.num_wins, Float) / games
+        # A minimum keeps players with one lucky game off the top
+        return win_rate, win_rate.desc(), games >= max(min_games, 1)
+    if board == "fastest_win":
+        return User.best_win_moves, User.best_win_moves.asc(), User.best_win_moves.isnot(None)
+    raise ValueError(f"Unknown leaderboard: {board}")
+
+
+def refresh_leaderboard(db, board: str, min_games: int) -> int:
+    """Rebuild one board's ranking in a single transaction; returns its size.
+
+    Ranks are computed by the database (RANK(), so ties share a rank) in one
+    INSERT ... SELECT, so the full-table sort runs once per refresh instead
+    of once per request. Readers see the previous ranking until the commit.
+    """
+    value, ordering, condition = board_query(board, min_games)
+    ranked = select(
+        literal(board), User.user_id, func.rank().over(order_by=ordering), value
+    ).where(condition)
+
+    db.session.execute(delete(LeaderboardEntry).where(LeaderboardEntry.board == board))
+    db.session.execute(
+        insert(LeaderboardEntry).from_select(["board", "user_id", "rank", "value"], ranked)
+    )
+    total = db.session.scalar(
+        select(func.count()).select_from(LeaderboardEntry).where(LeaderboardEntry.board == board)
+    )
+    db.session.merge(LeaderboardRefresh(board=board, total=total, refreshed_at=datetime.now()))
+    db.session.commit()
+    return total
+
+
+def leaderboards_refreshed_within(db, seconds: float) -> bool:
+    """True if every board was rebuilt less than seconds ago."""
+    boards, oldest = db.session.execute(
+        select(func.count(), func.min(LeaderboardRefresh.refreshed_at))
+    ).one()
+    return boards == len(BOARDS) and oldest > datetime.now() - timedelta(seconds=seconds)
+
+
+def refresh_leaderboards(app, db) -> dict[str, int]:
+    stats = {}
+    for board in BOARDS:
+        start = time.perf_counter()
+        try:
+            stats[board] = refresh_leaderboard(db, board, app.config.get("LEADERBOARD_MIN_GAMES", 10))
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Refreshing the {board} leaderboard failed: {e}")
+            continue
+        record_job(f"refresh_leaderboard_{board}", time.perf_counter() - start)
+    return stats
+
+
+def top_entries(board: str, limit: int) -> list[LeaderboardEntry]:
+    return (
+        LeaderboardEntry.query
+        .filter(LeaderboardEntry.board == board, LeaderboardEntry.rank <= limit)
+        .order_by(LeaderboardEntry.rank, LeaderboardEntry.user_id)
+        .limit(limit)
+        .all()
+    )
+
+
+def entry_payload(board: str, entry: LeaderboardEntry, user_id: str) -> dict:
+    return {
+        "rank": entry.rank,
+        # A prefix is enough to tell players apart; full ids stay private
+        "player": entry.user_id[:8],
+        "value": round(entry.value, 4) if board == "win_rate" else int(entry.value),
+        "you": entry.user_id == user_id,
+    }
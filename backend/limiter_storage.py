@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from limits.storage import Storage
+
+# /dev/shm is RAM-backed on Linux, so the counter file never touches disk
+DEFAULT_SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# Drop expired counters roughly once every this many increments
+PURGE_INTERVAL = 1000
+
+
+class LocalSQLiteStorage(Storage):
+    """Fixed-window rate limit counters shared by every worker on one host.
+
+    Counters live in a WAL-mode SQLite file (by default under /dev/shm), so
+    gunicorn workers enforce a single limit per key instead of one per process,
+    without a network round trip per request. Use Redis for multi-host setups.
+
+        RATELIMIT_STORAGE_URI="sqlite:////dev/shm/arithmetic-merge-limits.db"
+    """
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._path = uri[len("sqlite:///"):]
+        self._timeout = float(options.get("timeout", 1.0))
+        self._local = threading.local()
+        self._increments = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS limits (key TEXT PRIMARY KEY, count INTEGER NOT NULL, expiry REAL NOT NULL)"
+        )
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        conn = self._connection()
+        count = conn.execute(
+            """
+            INSERT INTO limits (key, count, expiry) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                count = CASE WHEN expiry <= ? THEN excluded.count ELSE count + excluded.count END,
+                expiry = CASE WHEN expiry <= ? THEN excluded.expiry ELSE expiry END
+            RETURNING count
+            """,
+            (key, amount, now + expiry, now, now),
+        ).fetchone()[0]
+
+        self._increments += 1
+        if self._increments % PURGE_INTERVAL == 0:
+            conn.execute("DELETE FROM limits WHERE expiry <= ?", (now,))
+        return count
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT count FROM limits WHERE key = ? AND expiry > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT expiry FROM limits WHERE key = ? AND expiry > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        return self._connection().execute("DELETE FROM limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM limits WHERE key = ?", (key,))
+
+
+def limiter_config_from_env() -> dict:
+    """Flask-Limiter settings: RATELIMIT_STORAGE_URI, else REDIS_URL, else per-process memory."""
+    storage_uri = os.getenv("RATELIMIT_STORAGE_URI") or os.getenv("REDIS_URL") or "memory://"
+    config = {"RATELIMIT_STORAGE_URI": storage_uri}
+
+    if storage_uri.startswith(("redis://", "rediss://")):
+        # Bound the Redis round trip every request pays; if Redis errors or
+        # times out, fall back to per-process counters instead of failing requests
+        timeout = float(os.getenv("RATELIMIT_REDIS_TIMEOUT", "0.05"))
+        config["RATELIMIT_STORAGE_OPTIONS"] = {"socket_timeout": timeout, "socket_connect_timeout": timeout}
+        config["RATELIMIT_IN_MEMORY_FALLBACK_ENABLED"] = True
+    elif storage_uri.startswith("sqlite://"):
+        config["RATELIMIT_STORAGE_OPTIONS"] = {"timeout": float(os.getenv("RATELIMIT_SQLITE_TIMEOUT", "1.0"))}
+
+    return config
@@ -0,0 +1,136 @@
+import hmac
+import os
+import time
+from flask import Response, abort, g, has_request_context, request
+from db_pool import pool_metrics
+
+# prometheus_client is imported by init_metrics(), so the record_* helpers
+# below are free no-ops in processes that never enable metrics.
+_metrics = None
+
+REPLAY_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+REPLAY_MOVES_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25)
+
+
+def _build_metrics() -> dict:
+    from prometheus_client import Counter, Gauge, Histogram
+
+    return {
+        "request_seconds": Histogram(
+            "http_request_duration_seconds", "Request latency by route",
+            ["endpoint", "method", "status"],
+        ),
+        "db_queries": Histogram(
+            "http_request_db_queries", "SQL statements executed per request",
+            ["endpoint"], buckets=DB_QUERY_BUCKETS,
+        ),
+        "limiter_rejections": Counter(
+            "rate_limit_rejections_total", "Requests rejected by the rate limiter", ["endpoint"],
+        ),
+        "replay_seconds": Histogram(
+            "replay_simulation_seconds", "simulate_game duration", ["endpoint"],
+            buckets=REPLAY_SECONDS_BUCKETS,
+        ),
+        "replay_moves": Histogram(
+            "replay_moves", "Moves per submitted replay", ["endpoint"],
+            buckets=REPLAY_MOVES_BUCKETS,
+        ),
+        "job_seconds": Histogram(
+            "scheduler_job_duration_seconds", "Background job duration", ["job"],
+        ),
+        "pool_checked_out": Gauge(
+            "db_pool_checked_out_connections", "Connections currently checked out",
+            multiprocess_mode="livesum",
+        ),
+        "pool_wait_seconds": Histogram(
+            "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+            buckets=REPLAY_SECONDS_BUCKETS,
+        ),
+        "pool_timeouts": Counter(
+            "db_pool_timeouts_total", "Checkouts that timed out waiting for a connection",
+        ),
+    }
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    if has_request_context():
+        g.db_queries = g.get("db_queries", 0) + 1
+
+
+def record_replay(seconds: float, num_moves: int) -> None:
+    if _metrics is None:
+        return
+    endpoint = request.endpoint if has_request_context() else "offline"
+    _metrics["replay_seconds"].labels(endpoint).observe(seconds)
+    _metrics["replay_moves"].labels(endpoint).observe(num_moves)
+
+
+def record_rate_limit_rejection(request_limit) -> None:
+    """Flask-Limiter on_breach callback: counts every 429 the limiter sends,
+    including ones raised before any other before_request hook has run."""
+    if _metrics is not None:
+        _metrics["limiter_rejections"].labels(request.endpoint or "unmatched").inc()
+
+
+def record_job(job: str, seconds: float) -> None:
+    if _metrics is not None:
+        _metrics["job_seconds"].labels(job).observe(seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate the per-worker files written by every gunicorn worker
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_metrics(app) -> None:
+    global _metrics
+    if _metrics is None:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        _metrics = _build_metrics()
+        event.listen(Engine, "before_cursor_execute", _count_query)
+        pool_metrics.add_observer(
+            on_checkout=_metrics["pool_wait_seconds"].observe,
+            on_timeout=_metrics["pool_timeouts"].inc,
+        )
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        start = g.pop("request_start", None)
+        if start is None:
+            return response
+
+        endpoint = request.endpoint or "unmatched"
+        _metrics["request_seconds"].labels(endpoint, request.method, str(response.status_code)).observe(
+            time.perf_counter() - start
+        )
+        _metrics["db_queries"].labels(endpoint).observe(g.get("db_queries", 0))
+        _metrics["pool_checked_out"].set(pool_metrics.snapshot()["checked_out"])
+        return response
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        token = app.config.get("METRICS_TOKEN")
+        if not token:
+            # Fail closed: without a token, only serve if explicitly made public
+            if not app.config.get("METRICS_PUBLIC"):
+                abort(404)
+        elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            abort(401, description="Missing or invalid metrics token")
+
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
@@ -0,0 +1,16 @@
+from extensions import db
+from datetime import datetime
+
+# Longest seed accepted by /api/verify and /api/restart (routes.solo.parse_seed_and_moves)
+MAX_SEED_LENGTH = 400
+
+# One row per verified or abandoned game, written in batches by GameRecorder
+class GameRecord(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(36), nullable=False, index=True)
+    seed = db.Column(db.String(MAX_SEED_LENGTH), nullable=False)
+    result = db.Column(db.String(16), nullable=False)  # Won, Lost, Abandoned or Invalid
+    num_moves = db.Column(db.Integer, nullable=False)
+    moves = db.Column(db.LargeBinary, nullable=False)  # game_records.encode_moves()
+    verify_ms = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False, index=True)
@@ -0,0 +1,9 @@
+from extensions import db
+from datetime import datetime
+
+# Stored responses for retried POSTs; expired rows are removed by the daily cleanup
+class IdempotencyKey(db.Model):
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of endpoint, user and client key
+    status_code = db.Column(db.Integer, nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False, index=True)
@@ -0,0 +1,7 @@
+from extensions import db
+
+# When each scheduled job last started, so a run inside its interval is skipped
+# no matter which process or host fires it (see background.claim_job_run)
+class JobRun(db.Model):
+    name = db.Column(db.String(64), primary_key=True)
+    last_run_at = db.Column(db.DateTime, nullable=False)
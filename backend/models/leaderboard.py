@@ -0,0 +1,18 @@
+from extensions import db
+
+# Rankings rebuilt by leaderboard.refresh_leaderboard(); requests only read them.
+# (board, rank) serves the top-N, the primary key serves "rank of user X".
+class LeaderboardEntry(db.Model):
+    __table_args__ = (db.Index("ix_leaderboard_entry_board_rank", "board", "rank"),)
+
+    board = db.Column(db.String(16), primary_key=True)
+    user_id = db.Column(db.String(36), primary_key=True)
+    rank = db.Column(db.Integer, nullable=False)
+    value = db.Column(db.Float, nullable=False)
+
+
+# One row per board: when it was last rebuilt and how many players it ranks
+class LeaderboardRefresh(db.Model):
+    board = db.Column(db.String(16), primary_key=True)
+    total = db.Column(db.Integer, nullable=False)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
@@ -0,0 +1,26 @@
+import hashlib
+from extensions import db
+from datetime import datetime
+
+# One row per game a user has submitted, so each seed is only counted once
+class SeenSeed(db.Model):
+    __table_args__ = (db.UniqueConstraint("user_id", "seed_hash"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(36), nullable=False)
+    seed_hash = db.Column(db.String(32), nullable=False)  # blake2b of the seed, bounded size
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False, index=True)
+
+    @staticmethod
+    def hash_seed(seed: str) -> str:
+        return hashlib.blake2b(seed.encode(), digest_size=16).hexdigest()
+
+    @classmethod
+    def exists(cls, user_id: str, seed: str) -> bool:
+        return db.session.query(
+            cls.query.filter_by(user_id=user_id, seed_hash=cls.hash_seed(seed)).exists()
+        ).scalar()
+
+    @classmethod
+    def for_seed(cls, user_id: str, seed: str) -> "SeenSeed":
+        return cls(user_id=user_id, seed_hash=cls.hash_seed(seed))
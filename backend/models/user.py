@@ -4,7 +4,14 @@ from datetime import datetime
 # session expires in 365*2 days (about 2 years)
 class User(db.Model):
     user_id = db.Column(db.String(36), primary_key=True)  # UUID
-    num_wins = db.Column(db.Integer, default=0, nullable=False)
+    num_wins = db.Column(db.Integer, default=0, nullable=False, index=True)  # wins leaderboard sort
     num_losses = db.Column(db.Integer, default=0, nullable=False)
     num_abandoned_games = db.Column(db.Integer, default=0, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False, index=True)
+    best_win_moves = db.Column(db.Integer, nullable=True, index=True)  # fewest moves in a verified win
+
+    @property
+    def stats_version(self) -> int:
+        # Every stat change increments exactly one counter, so their sum is a
+        # per-user version that grows with each change
+        return self.num_wins + self.num_losses + self.num_abandoned_games
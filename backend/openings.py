@@ -0,0 +1,64 @@
+import threading
+import uuid
+from collections import OrderedDict, deque
+from utils.replay import opening_state
+
+
+class OpeningPool:
+    """Server-issued seeds with their opening board and RNG state precomputed.
+
+    issue() hands out a seed from a pool of ready openings, refilled in a
+    background thread when it runs low, and remembers the opening of each
+    issued seed (bounded LRU) so verification can start from it instead of
+    rebuilding it. The pool is per process; a seed verified by another worker
+    is simply rebuilt from the seed.
+    """
+    def __init__(self, pool_size: int, cache_size: int) -> None:
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        self._ready = deque()
+        self._issued = OrderedDict()
+        self._lock = threading.Lock()
+        self._refilling = False
+
+    def issue(self) -> str:
+        with self._lock:
+            ready = self._ready.popleft() if self._ready else None
+        seed, opening = ready or self._build()
+
+        with self._lock:
+            self._issued[seed] = opening
+            while len(self._issued) > self.cache_size:
+                self._issued.popitem(last=False)
+        self._maybe_refill()
+        return seed
+
+    def get(self, seed: str) -> tuple[tuple, int] | None:
+        with self._lock:
+            return self._issued.get(seed)
+
+    def refill(self) -> None:
+        try:
+            while len(self._ready) < self.pool_size:
+                item = self._build()
+                with self._lock:
+                    self._ready.append(item)
+        finally:
+            self._refilling = False
+
+    def _maybe_refill(self) -> None:
+        if self.pool_size <= 0:
+            return
+        with self._lock:
+            if self._refilling or len(self._ready) > self.pool_size // 2:
+                return
+            self._refilling = True
+        threading.Thread(target=self.refill, name="opening-pool-refill", daemon=True).start()
+
+    @staticmethod
+    def _build() -> tuple[str, tuple[tuple, int]]:
+        seed = str(uuid.uuid4())
+        return seed, opening_state(seed)
+
+    def __len__(self) -> int:
+        return len(self._issued)
@@ -0,0 +1,60 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def replay_digest(seed: str, moves: list[str]) -> bytes:
+    return hashlib.blake2b(f"{seed}\x00{','.join(moves)}".encode(), digest_size=16).digest()
+
+
+class ReplayCache:
+    """Bounded LRU of simulate_game outcomes keyed by replay_digest().
+
+    Each entry also records which users already had their counters updated for
+    that replay, so a retried /api/verify is answered without replaying or
+    counting twice. The cache is per process: a retry that lands on another
+    worker is still counted once (the seen-seed check rejects it), but gets
+    the "already submitted" response instead of the original one.
+    """
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> tuple[bool, str | None] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry["result"]
+
+    def put(self, key: bytes, result: tuple[bool, str | None]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._store(key, result)
+
+    def _store(self, key: bytes, result: tuple[bool, str | None]) -> dict:
+        entry = self._entries.setdefault(key, {"result": result, "applied": set()})
+        entry["result"] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def is_applied(self, key: bytes, user_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and user_id in entry["applied"]
+
+    def mark_applied(self, key: bytes, user_id: str, result: tuple[bool, str | None]) -> None:
+        """Record that user_id was counted for this replay, re-adding the entry
+        if it was evicted since put()."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._store(key, result)["applied"].add(user_id)
+
+    def __len__(self) -> int:
+        return len(self._entries)
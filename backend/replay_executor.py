@@ -0,0 +1,43 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from utils.replay import simulate_game
+
+# Replays are pure CPU. With REPLAY_WORKERS > 0 they run in a per-worker
+# process pool, so a long replay no longer holds the GIL that the worker's
+# other request threads need while they wait on the database or limiter.
+_workers = 0
+_executor = None
+_lock = threading.Lock()
+
+
+def init_replay_executor(app) -> None:
+    global _workers
+    _workers = app.config.get("REPLAY_WORKERS", 0)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # Created on first use, i.e. after gunicorn forks the worker.
+                # spawn: forking a process that already runs threads is unsafe.
+                _executor = ProcessPoolExecutor(
+                    max_workers=_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+
+def simulate(seed, moves: list[str], opening=None) -> tuple[bool, str | None]:
+    if _workers <= 0:
+        return simulate_game(seed, moves, opening)
+    return _get_executor().submit(simulate_game, seed, moves, opening).result()
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
@@ -0,0 +1,54 @@
+import threading
+import time
+from flask import jsonify
+from sqlalchemy import text
+
+
+def check_readiness(app, db, limiter) -> dict:
+    checks = {}
+
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+    except Exception as e:
+        app.logger.warning(f"Readiness: database unreachable: {e}")
+        checks["database"] = "unavailable"
+
+    if limiter in app.extensions.get("limiter", set()):
+        try:
+            checks["limiter"] = "ok" if limiter.storage.check() else "unavailable"
+        except Exception as e:
+            app.logger.warning(f"Readiness: limiter storage unreachable: {e}")
+            checks["limiter"] = "unavailable"
+    else:
+        checks["limiter"] = "disabled"
+
+    return checks
+
+
+def register_health_routes(app, db, limiter):
+    cache_lock = threading.Lock()
+    cached = {"checks": None, "expires_at": 0.0}
+
+    @app.route("/healthz", methods=["GET"])
+    def healthz():
+        # Liveness only: no session, no DB, no limiter storage
+        return jsonify({"status": "ok"})
+
+    @app.route("/readyz", methods=["GET"])
+    def readyz():
+        # Probes arrive every few seconds from every load balancer node, so the
+        # result is reused for READINESS_CACHE_SECONDS instead of hitting the DB each time
+        with cache_lock:
+            now = time.monotonic()
+            if cached["checks"] is None or now >= cached["expires_at"]:
+                cached["checks"] = check_readiness(app, db, limiter)
+                cached["expires_at"] = now + app.config.get("READINESS_CACHE_SECONDS", 5)
+            checks = cached["checks"]
+
+        ready = all(status != "unavailable" for status in checks.values())
+        return jsonify({
+            "status": "ready" if ready else "unavailable",
+            "checks": checks,
+        }), 200 if ready else 503
@@ -0,0 +1,70 @@
+import functools
+import hashlib
+from datetime import datetime, timedelta
+from flask import Response, abort, current_app, make_response, request, session
+from sqlalchemy.exc import IntegrityError
+from models.idempotency_key import IdempotencyKey
+from routes.request_body import get_request_json
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def get_idempotency_key() -> str:
+    """The client's Idempotency-Key header, else a digest of the parsed body.
+
+    Retries resend the same body, so clients that never send the header are
+    still deduplicated. The digest is taken over the parsed payload rather
+    than the raw bytes so the body is still read once, as a stream.
+    """
+    key = request.headers.get(HEADER)
+    if key is None:
+        body = current_app.json.dumps(get_request_json())
+        return "body:" + hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+    if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+        abort(400, description=f"{HEADER} must be 1-{MAX_KEY_LENGTH} printable characters")
+    return "header:" + key
+
+
+def storage_key(user_id: str, key: str) -> str:
+    return hashlib.sha256(f"{request.endpoint}\x00{user_id}\x00{key}".encode()).hexdigest()
+
+
+def idempotent(db):
+    """Answer a repeated POST from the stored response instead of running the view.
+
+    Responses returned by the view other than 5xx/429 are kept for
+    IDEMPOTENCY_TTL_SECONDS (0 disables); aborted requests are not stored.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            ttl = current_app.config.get("IDEMPOTENCY_TTL_SECONDS", 86400)
+            user_id = session.get("user_id")
+            if ttl <= 0 or not user_id:
+                return view(*args, **kwargs)
+
+            key = storage_key(user_id, get_idempotency_key())
+            stored = db.session.get(IdempotencyKey, key)
+            if stored and stored.created_at >= datetime.now() - timedelta(seconds=ttl):
+                response = Response(stored.body, status=stored.status_code, mimetype="application/json")
+                response.headers["Idempotent-Replayed"] = "true"
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code < 500 and response.status_code != 429:
+                try:
+                    if stored:
+                        db.session.delete(stored)
+                    db.session.add(IdempotencyKey(
+                        key=key,
+                        status_code=response.status_code,
+                        body=response.get_data(as_text=True),
+                    ))
+                    db.session.commit()
+                except IntegrityError:
+                    # A concurrent duplicate stored its response first
+                    db.session.rollback()
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,33 @@
+from flask import abort, jsonify, request, session
+from leaderboard import BOARDS, entry_payload, top_entries
+from models.leaderboard import LeaderboardEntry, LeaderboardRefresh
+
+MAX_LIMIT = 100
+
+
+def parse_limit() -> int:
+    limit = request.args.get("limit", "10")
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+        abort(400, description=f"limit must be an integer from 1 to {MAX_LIMIT}")
+    return int(limit)
+
+
+def register_leaderboard_routes(app, db):
+    @app.route("/api/leaderboard/<board>", methods=["GET"])
+    def get_leaderboard(board):
+        if board not in BOARDS:
+            abort(404, description=f"Unknown leaderboard; expected one of: {', '.join(BOARDS)}")
+        limit = parse_limit()
+        user_id = session.get("user_id")
+
+        # Read from the precomputed ranking: an index range for the top, a
+        # primary-key lookup for the caller's own rank
+        refresh = db.session.get(LeaderboardRefresh, board)
+        own = db.session.get(LeaderboardEntry, (board, user_id)) if user_id else None
+        return jsonify({
+            "board": board,
+            "refreshed_at": refresh.refreshed_at.isoformat() if refresh else None,
+            "total": refresh.total if refresh else 0,
+            "entries": [entry_payload(board, entry, user_id) for entry in top_entries(board, limit)],
+            "you": entry_payload(board, own, user_id) if own else None,
+        })
@@ -0,0 +1,38 @@
+from flask import request, session
+
+# Which per-request machinery each endpoint goes through.
+#   session:    ensure_session looks up (or creates) the caller's User row
+#   rate_limit: the request is counted against limiter storage; NEW_SESSIONS_ONLY
+#               counts only requests without a session, which would create a User row
+# Endpoints not listed here get DEFAULT_POLICY.
+NEW_SESSIONS_ONLY = "new_sessions_only"
+
+DEFAULT_POLICY = {"session": True, "rate_limit": True}
+
+# CORS preflights are answered by Flask/Flask-CORS and never reach a view
+PREFLIGHT_POLICY = {"session": False, "rate_limit": False}
+
+ROUTE_POLICIES = {
+    "static": {"session": False, "rate_limit": False},
+    "healthz": {"session": False, "rate_limit": False},
+    "readyz": {"session": False, "rate_limit": False},
+    "metrics": {"session": False, "rate_limit": False},
+    # A cheap, frequently polled read (often answered with a 304 before any
+    # query), so established sessions skip the limiter storage round trip;
+    # cookieless requests stay limited since each one inserts a User
+    "get_statistics": {"session": True, "rate_limit": NEW_SESSIONS_ONLY},
+}
+
+
+def is_rate_limited() -> bool:
+    rate_limit = get_route_policy()["rate_limit"]
+    if rate_limit == NEW_SESSIONS_ONLY:
+        # The session cookie is signed, so a user_id in it was issued by us
+        return not isinstance(session.get("user_id"), str)
+    return rate_limit
+
+
+def get_route_policy() -> dict:
+    if request.method == "OPTIONS":
+        return PREFLIGHT_POLICY
+    return ROUTE_POLICIES.get(request.endpoint, DEFAULT_POLICY)
@@ -0,0 +1,202 @@
+import codecs
+import json
+import re
+from flask import abort, current_app, request
+from utils.replay import VALID_MOVES
+
+CHUNK_SIZE = 64 * 1024
+ENVIRON_KEY = "arithmetic_merge.request_json"
+MOVES_ERROR = "moves must be a list of: up, down, left, right"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Parsed moves share the four constant strings instead of one object per element
+_CANONICAL_MOVES = {move: move for move in VALID_MOVES}
+_QUOTED_MOVES = {f'"{move}"': move for move in VALID_MOVES}
+_decoder = json.JSONDecoder()
+
+
+class InvalidMoves(ValueError):
+    pass
+
+
+class _StreamBuffer:
+    """The unread part of a UTF-8 JSON stream, refilled one chunk at a time."""
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> None:
+        chunk = self._stream.read(CHUNK_SIZE)
+        self.eof = not chunk
+        # Drop the consumed prefix so only the pending token stays in memory
+        self.text = self.text[self.pos:] + self._decode(chunk, final=self.eof)
+        self.pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or self.eof:
+                return self.text[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value, reading more of the stream as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A value touching the end of the buffer may continue in the next chunk
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def moves(self, max_moves: int) -> list[str]:
+        self.expect("[")
+        moves = []
+        if self.peek() == "]":
+            self.pos += 1
+            return moves
+        while True:
+            close = self.text.find("]", self.pos)
+            # Up to the closing bracket, else up to the last complete element buffered
+            end = close if close != -1 else self.text.rfind(",", self.pos)
+            plain = _plain_moves(self.text[self.pos:end]) if end > self.pos else None
+            if plain is not None:
+                moves.extend(plain)
+                self.pos = end + 1
+                done = close != -1
+            else:
+                done = self._decode_moves(moves, end)
+            if len(moves) > max_moves:
+                raise InvalidMoves(f"moves must have at most {max_moves} entries")
+            if done:
+                return moves
+
+    def _decode_moves(self, moves: list[str], until: int) -> bool:
+        """Decode elements one at a time until past until; True at the closing bracket.
+
+        Handles what _plain_moves doesn't: escapes, an element cut by the
+        chunk boundary, and malformed or invalid elements.
+        """
+        while True:
+            move = self.value()
+            if not isinstance(move, str) or move not in _CANONICAL_MOVES:
+                raise InvalidMoves(MOVES_ERROR)
+            moves.append(_CANONICAL_MOVES[move])
+            if self.peek() == "]":
+                self.pos += 1
+                return True
+            self.expect(",")
+            if self.pos > until:
+                return False
+
+
+def _plain_moves(segment: str) -> list[str] | None:
+    """The moves in a comma-separated run of quoted move names, else None.
+
+    Works on the few distinct elements rather than each one, so a long run
+    costs about as much as the split.
+    """
+    elements = segment.split(",")
+    lookup = {}
+    for element in set(elements):
+        move = _QUOTED_MOVES.get(element.strip(" \t\n\r"))
+        if move is None:
+            return None
+        lookup[element] = move
+    return list(map(lookup.__getitem__, elements))
+
+
+def parse_json_body(stream, max_moves: int):
+    """Parse a JSON request body from a stream, validating "moves" as it is read.
+
+    Elements of a top-level "moves" list are checked chunk by chunk, so a body
+    with an invalid move or more than max_moves moves is rejected with
+    InvalidMoves without reading the rest of it. Malformed JSON raises
+    ValueError.
+    """
+    buffer = _StreamBuffer(stream)
+    if buffer.peek() != "{":
+        payload = buffer.value()
+    else:
+        buffer.pos += 1
+        payload = {}
+        if buffer.peek() == "}":
+            buffer.pos += 1
+        else:
+            while True:
+                key = buffer.value()
+                if not isinstance(key, str):
+                    raise ValueError(f"Expected a string key at offset {buffer.pos}")
+                buffer.expect(":")
+                if key == "moves" and buffer.peek() == "[":
+                    payload[key] = buffer.moves(max_moves)
+                else:
+                    payload[key] = buffer.value()
+                if buffer.peek() == "}":
+                    buffer.pos += 1
+                    break
+                buffer.expect(",")
+    if buffer.peek():
+        raise ValueError(f"Extra data at offset {buffer.pos}")
+    return payload
+
+
+def check_moves(moves: list, max_moves: int) -> None:
+    if len(moves) > max_moves:
+        raise InvalidMoves(f"moves must have at most {max_moves} entries")
+    try:
+        valid = _CANONICAL_MOVES.keys() >= set(moves)
+    except TypeError:  # an unhashable element such as a nested list
+        valid = False
+    if not valid:
+        raise InvalidMoves(MOVES_ERROR)
+
+
+def get_request_json() -> dict:
+    """The request's JSON object, or {} for a missing, non-JSON or malformed body.
+
+    Parsed once per request. Bodies larger than one chunk, or of unknown
+    length, are parsed from the input stream as they arrive, so an invalid
+    or over-long moves list is rejected early; smaller ones are read whole
+    and parsed by the app's JSON provider. MAX_CONTENT_LENGTH caps the body
+    size either way (larger bodies get a 413).
+    """
+    # Kept in the WSGI environ: g belongs to the app context, which can
+    # outlive a single request
+    if ENVIRON_KEY not in request.environ:
+        request.environ[ENVIRON_KEY] = read_request_json()
+    return request.environ[ENVIRON_KEY]
+
+
+def read_request_json() -> dict:
+    if not request.is_json:
+        return {}
+    max_moves = current_app.config.get("MAX_REPLAY_MOVES", 100000)
+    try:
+        if request.content_length is not None and request.content_length <= CHUNK_SIZE:
+            payload = current_app.json.loads(request.get_data(cache=False))
+            if isinstance(payload, dict) and isinstance(payload.get("moves"), list):
+                check_moves(payload["moves"], max_moves)
+        else:
+            payload = parse_json_body(request.stream, max_moves)
+    except InvalidMoves as e:
+        abort(400, description=str(e))
+    except (ValueError, RecursionError):
+        return {}
+    if not isinstance(payload, dict):
+        abort(400, description="Expected a JSON object")
+    return payload
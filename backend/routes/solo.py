@@ -1,32 +1,32 @@
 from datetime import datetime, timedelta
+import time
 import uuid
-from flask import abort, jsonify, request, session
+from flask import abort, current_app, jsonify, request, session
 from sqlalchemy.exc import IntegrityError
+from game_records import GameRecorder
+from models.game_record import MAX_SEED_LENGTH
+from metrics import record_replay
+from models.seen_seed import SeenSeed
 from models.user import User
-from utils.game import ADDITION, DeterministicRNG, Game, SPACE, SUBTRACTION, construct_grid
+from openings import OpeningPool
+from replay_cache import ReplayCache, replay_digest
+import replay_executor
+from routes.idempotency import idempotent
+from routes.policy import get_route_policy
+from routes.request_body import get_request_json
+from slow_log import record_replay_capture
+from stats_cache import StatsVersionCache, stats_etag
+from utils import profiling
+from utils.replay import (
+    NUM_COLS,
+    NUM_ROWS,
+    apply_move,
+    construct_game,
+    construct_grid,
+    simulate_game,
+)
 from utils.util import generate_user_id
 
-NUM_ROWS = 6
-NUM_COLS = 7
-INCLUDED_OPERATIONS = [ADDITION, SUBTRACTION]
-OPERATOR_SPAWN_RATE = 0.67
-INCLUDED_DIGITS = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
-GENERATED_TILES_PER_TURN = 2
-VALID_MOVES = {"up", "down", "left", "right"}
-
-
-def construct_game(grid, rng=None) -> Game:
-    return Game(
-        grid,
-        rng,
-        NUM_ROWS,
-        NUM_COLS,
-        INCLUDED_OPERATIONS,
-        OPERATOR_SPAWN_RATE,
-        INCLUDED_DIGITS,
-        GENERATED_TILES_PER_TURN,
-    )
-
 
 def get_user(db, user_id):
     user = db.session.get(User, user_id)
@@ -47,15 +47,6 @@ def get_stats_payload(user: User) -> dict:
     }
 
 
-def get_request_json() -> dict:
-    payload = request.get_json(silent=True)
-    if payload is None:
-        return {}
-    if not isinstance(payload, dict):
-        abort(400, description="Expected a JSON object")
-    return payload
-
-
 def parse_user_id_from_request() -> str | None:
     payload = get_request_json()
     user_id = payload.get("user_id")
@@ -96,34 +87,33 @@ def create_new_session(app, db) -> None:
     abort(500, description="Failed to create session")
 
 
-def apply_move(game: Game, move: str) -> None:
-    match move:
-        case "up":
-            game.slide_up()
-        case "down":
-            game.slide_down()
-        case "left":
-            game.slide_left()
-        case "right":
-            game.slide_right()
+def run_replay(seed, moves: list[str], opening=None) -> tuple[bool, str | None]:
+    if profiling.ENABLED:
+        return run_profiled_replay(seed, moves, opening)
 
-def simulate_game(seed, moves: list[str]) -> tuple[bool, str | None]:
-    local_rng = DeterministicRNG(str(seed))
-    game = construct_game(construct_grid(NUM_ROWS, NUM_COLS, SPACE), local_rng)
-    game.generate_tiles()
+    start = time.perf_counter()
+    result = replay_executor.simulate(seed, moves, opening)
+    seconds = time.perf_counter() - start
+    record_replay(seconds, len(moves))
+    record_replay_capture(seed, moves, seconds)
+    return result
 
-    for move in moves:
-        if game.get_state() != "In Progress":
-            return False, None
 
-        valid_moves = set(game.get_valid_moves())
-        if move not in valid_moves:
-            return False, None
+def run_profiled_replay(seed, moves: list[str], opening=None) -> tuple[bool, str | None]:
+    with profiling.profile_replay() as report:
+        result = simulate_game(seed, moves, opening)
+    record_replay(report["seconds"], len(moves))
+    record_replay_capture(seed, moves, report["seconds"], profiling.format_summary(report))
 
-        apply_move(game, move)
-        game.generate_tiles()
-
-    return True, game.get_state()
+    if report["seconds"] >= profiling.SLOW_REPLAY_SECONDS:
+        current_app.logger.warning(
+            f"Slow replay on {request.endpoint}: {report['seconds'] * 1000:.1f} ms, "
+            f"{len(moves)} moves, seed {seed}: {profiling.format_summary(report)}"
+        )
+        current_app.logger.info(f"Replay folded stacks (us):\n{profiling.format_folded(report)}")
+        if "pstats" in report:
+            current_app.logger.info(f"Replay cProfile:\n{report['pstats']}")
+    return result
 
 
 def parse_seed_and_moves() -> tuple[str, list[str]]:
@@ -133,17 +123,18 @@ def parse_seed_and_moves() -> tuple[str, list[str]]:
 
     if seed is None:
         abort(400, description="Missing required field: seed")
+    seed = str(seed)
+    # Seeds are stored verbatim in the game history, so bound their size
+    if len(seed) > MAX_SEED_LENGTH:
+        abort(400, description=f"seed must be at most {MAX_SEED_LENGTH} characters")
+    # get_request_json already rejected a moves list with any invalid element
     if not isinstance(moves, list):
         abort(400, description="Missing required field: moves (list)")
-    if not all(isinstance(move, str) and move in VALID_MOVES for move in moves):
-        abort(400, description="moves must be a list of: up, down, left, right")
 
-    return str(seed), moves
+    return seed, moves
 
 
-def verification_failed_response(db, user: User):
-    user.num_abandoned_games += 1
-    db.session.commit()
+def verification_failed_response(user: User):
     return jsonify({
         "verified": False,
         "message": "Game verification failed",
@@ -151,10 +142,65 @@ def verification_failed_response(db, user: User):
     }), 200
 
 
+def duplicate_game_response(user: User):
+    # 200 rather than an error so a client resubmitting after a reload can move on
+    return jsonify({
+        "verified": False,
+        "message": "Game already submitted",
+        **get_stats_payload(user),
+    }), 200
+
+
 def register_routes(app, db, limiter):
+    replay_cache = ReplayCache(app.config.get("REPLAY_CACHE_SIZE", 4096))
+    openings = OpeningPool(
+        app.config.get("OPENING_POOL_SIZE", 64),
+        app.config.get("OPENING_CACHE_SIZE", 10000),
+    )
+    recorder = GameRecorder(
+        app,
+        db,
+        app.config.get("GAME_RECORD_BATCH_SIZE", 500),
+        app.config.get("GAME_RECORD_FLUSH_SECONDS", 2),
+        app.config.get("GAME_RECORD_MAX_PENDING", 10000),
+    )
+    app.extensions["game_recorder"] = recorder
+    stats_versions = StatsVersionCache(
+        app.config.get("STATS_CACHE_SIZE", 10000),
+        app.config.get("STATS_CACHE_SECONDS", 5),
+    )
+
+    def cached_replay(key: bytes, seed, moves: list[str]) -> tuple[bool, str | None]:
+        result = replay_cache.get(key)
+        if result is None:
+            # Seeds issued by /api/game/new start from their stored opening
+            result = run_replay(seed, moves, openings.get(seed))
+            replay_cache.put(key, result)
+        return result
+
+    def remember_stats(user: User) -> None:
+        stats_versions.put(user.user_id, user.stats_version)
+
+    def with_stats_etag(response, user_id: str, version: int):
+        response.set_etag(stats_etag(user_id, version))
+        # Browsers revalidate every poll instead of reusing the body unasked
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    # Registered before ensure_session so an unchanged poll skips the User lookup
+    @app.before_request
+    def statistics_not_modified():
+        if request.endpoint != "get_statistics" or not request.if_none_match:
+            return None
+        user_id = session.get("user_id")
+        version = stats_versions.get(user_id) if isinstance(user_id, str) else None
+        if version is None or not request.if_none_match.contains(stats_etag(user_id, version)):
+            return None
+        return with_stats_etag(app.response_class(status=304), user_id, version)
+
     @app.before_request
     def ensure_session() -> None:
-        if request.endpoint in {"static"}:
+        if not get_route_policy()["session"]:
             return
 
         user_id = session.get("user_id")
@@ -171,44 +217,95 @@ def register_routes(app, db, limiter):
         user = get_user(db, current_user_id)
         if not user:
             abort(404, description="User not found")
-        return jsonify(get_stats_payload(user))
+        remember_stats(user)
+        response = with_stats_etag(jsonify(get_stats_payload(user)), user.user_id, user.stats_version)
+        return response.make_conditional(request)
+
+    @app.route("/api/game/new", methods=["POST"])
+    def new_game():
+        return jsonify({"seed": openings.issue()})
 
     @app.route("/api/verify", methods=["POST"])
+    # The limit is checked first, so neither the body nor the idempotency
+    # store is touched for a rejected request
     @limiter.limit("1 per 10 seconds")
+    @idempotent(db)
     def verify_game():
         user = get_user(db, session.get("user_id"))
         if not user:
             abort(404, description="User not found")
 
         seed, moves = parse_seed_and_moves()
-        verified, state = simulate_game(seed, moves)
-        if not verified:
-            return verification_failed_response(db, user)
-
-        if state == "Won":
-            user.num_wins += 1
-        elif state == "Lost":
-            user.num_losses += 1
+        key = replay_digest(seed, moves)
+        # A retried submission gets the same answer without being counted again
+        already_counted = replay_cache.is_applied(key, user.user_id)
+        if not already_counted:
+            # Any other submission of a seed this user already played is not counted
+            if SeenSeed.exists(user.user_id, seed):
+                return duplicate_game_response(user)
+            db.session.add(SeenSeed.for_seed(user.user_id, seed))
+        start = time.perf_counter()
+        verified, state = cached_replay(key, seed, moves)
+        verify_seconds = time.perf_counter() - start
+
+        result = state if verified and state in {"Won", "Lost"} else "Invalid"
+        if not already_counted:
+            if result == "Won":
+                user.num_wins += 1
+                if user.best_win_moves is None or len(moves) < user.best_win_moves:
+                    user.best_win_moves = len(moves)
+            elif result == "Lost":
+                user.num_losses += 1
+            else:
+                user.num_abandoned_games += 1
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # A concurrent submission of the same seed was counted first
+                db.session.rollback()
+                return duplicate_game_response(user)
+            recorder.record(user.user_id, seed, moves, result, verify_seconds)
+        if result == "Invalid":
+            response = verification_failed_response(user)
         else:
-            return verification_failed_response(db, user)
+            response = jsonify(get_stats_payload(user))
 
-        db.session.commit()
-        return jsonify(get_stats_payload(user))
+        replay_cache.mark_applied(key, user.user_id, (verified, state))
+        remember_stats(user)
+        return response
 
     @app.route("/api/restart", methods=["POST"])
+    # The limit is checked first, so neither the body nor the idempotency
+    # store is touched for a rejected request
     @limiter.limit("1 per 10 seconds")
+    @idempotent(db)
     def restart_game():
         user = get_user(db, session.get("user_id"))
         if not user:
             abort(404, description="User not found")
             
         seed, moves = parse_seed_and_moves()
-        replay_valid, state = simulate_game(seed, moves)
-        if not replay_valid:
-            return verification_failed_response(db, user)
-        if state != "In Progress":
+        if SeenSeed.exists(user.user_id, seed):
+            return duplicate_game_response(user)
+        start = time.perf_counter()
+        replay_valid, state = cached_replay(replay_digest(seed, moves), seed, moves)
+        verify_seconds = time.perf_counter() - start
+        if replay_valid and state != "In Progress":
             abort(400, description="Game is already terminal; restart only accepts in-progress games")
 
+        db.session.add(SeenSeed.for_seed(user.user_id, seed))
         user.num_abandoned_games += 1
-        db.session.commit()
-        return jsonify(get_stats_payload(user))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent submission of the same seed was counted first
+            db.session.rollback()
+            return duplicate_game_response(user)
+        if not replay_valid:
+            response = verification_failed_response(user)
+        else:
+            response = jsonify(get_stats_payload(user))
+        recorder.record(user.user_id, seed, moves, "Abandoned" if replay_valid else "Invalid", verify_seconds)
+
+        remember_stats(user)
+        return response
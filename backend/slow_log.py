@@ -0,0 +1,136 @@
+import glob
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from flask import g, has_request_context, request, session
+
+# Endpoints whose slow calls are captured with their full replay payload
+CAPTURED_ENDPOINTS = {"verify_game", "restart_game"}
+
+_db_timing_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    start = starts.pop()
+    if has_request_context():
+        g.db_seconds = g.get("db_seconds", 0.0) + time.perf_counter() - start
+
+
+def record_replay_capture(seed, moves: list[str], seconds: float, profile: str | None = None) -> None:
+    """Called by the routes so a slow request can be replayed offline."""
+    if has_request_context():
+        g.replay_capture = {
+            "seed": seed,
+            "num_moves": len(moves),
+            "moves": moves,
+            "simulate_seconds": seconds,
+            "profile": profile,
+        }
+
+
+def process_log_path(path: str, pid: int | None = None) -> str:
+    """The file this process writes: slow_requests.jsonl -> slow_requests.<pid>.jsonl.
+
+    Each gunicorn worker rotates its own file; rotating one shared file from
+    several processes loses or truncates entries.
+    """
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{os.getpid() if pid is None else pid}{ext}"
+
+
+def slow_log_files(path: str) -> list[str]:
+    """Every per-process file (and rotated backup) written for a configured log path."""
+    stem, ext = os.path.splitext(path)
+    files = set(glob.glob(f"{glob.escape(stem)}.*{glob.escape(ext)}"))
+    files.update(glob.glob(f"{glob.escape(stem)}.*{glob.escape(ext)}.*"))
+    if os.path.exists(path):
+        files.add(path)
+    return sorted(files)
+
+
+def read_slow_log(path: str) -> list[dict]:
+    """Entries from every process's file, oldest first."""
+    files = slow_log_files(path)
+    if not files:
+        raise FileNotFoundError(path)
+    entries = []
+    for name in files:
+        with open(name) as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    return sorted(entries, key=lambda entry: entry.get("timestamp", ""))
+
+
+def get_slow_logger(path: str) -> logging.Logger:
+    """One JSON-lines logger per file, size-bounded and rotated.
+
+    Pass a per-process path (process_log_path): the handler is not safe to
+    share between processes.
+    """
+    slow_logger = logging.getLogger(f"arithmetic_merge.slow_requests.{path}")
+    if not slow_logger.handlers:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=int(os.getenv("SLOW_REQUEST_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.getenv("SLOW_REQUEST_LOG_BACKUPS", "3")),
+            delay=True,
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        slow_logger.addHandler(handler)
+        slow_logger.setLevel(logging.INFO)
+        slow_logger.propagate = False
+    return slow_logger
+
+
+def init_slow_log(app) -> None:
+    global _db_timing_installed
+    path = app.config.get("SLOW_REQUEST_LOG") or os.path.join(app.instance_path, "slow_requests.jsonl")
+    threshold = app.config.get("SLOW_REQUEST_MS", 500) / 1000
+
+    if not _db_timing_installed:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _db_timing_installed = True
+
+    @app.before_request
+    def start_slow_log_timer() -> None:
+        g.slow_log_start = time.perf_counter()
+
+    @app.after_request
+    def log_slow_request(response):
+        start = g.pop("slow_log_start", None)
+        if start is None or request.endpoint not in CAPTURED_ENDPOINTS:
+            return response
+
+        elapsed = time.perf_counter() - start
+        if elapsed < threshold:
+            return response
+
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "user_id": session.get("user_id"),
+            "total_seconds": round(elapsed, 6),
+            "db_seconds": round(g.get("db_seconds", 0.0), 6),
+        }
+        capture = g.get("replay_capture")
+        if capture:
+            entry.update(capture)
+            entry["simulate_seconds"] = round(capture["simulate_seconds"], 6)
+        # Resolved per request so workers forked after create_app get their own file
+        get_slow_logger(process_log_path(path)).info(json.dumps(entry))
+        return response
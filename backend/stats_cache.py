@@ -0,0 +1,46 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def stats_etag(user_id: str, version: int) -> str:
+    return f"{user_id}.{version}"
+
+
+class StatsVersionCache:
+    """Bounded LRU of user_id -> stats version, each entry valid for ttl_seconds.
+
+    Lets GET /api/statistics answer a matching If-None-Match with 304 without
+    loading the User row. Entries are updated whenever this process changes a
+    user's stats; a change made by another worker is only seen once the entry
+    expires, so ttl_seconds bounds how long a poll can be answered stale.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> int | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            version, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return version
+
+    def put(self, user_id: str, version: int) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
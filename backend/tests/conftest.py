@@ -1085,9 +1085,19 @@ def seeded_client(client, app):
 @pytest.fixture
 def limiter_client(app):
     limiter.init_app(app)
+    # create_app runs the limiter right after the metrics timer and before the
+    # session hooks; move its before_request hook to the same place
+    hooks = app.before_request_funcs[None]
+    limiter_hook = hooks.pop()
+    timer = [i for i, hook in enumerate(hooks) if hook.__name__ == "start_request_timer"]
+    hooks.insert(timer[0] + 1 if timer else 0, limiter_hook)
     with app.test_client() as c:
         with app.app_context():
             yield c
+    # The limiter is a module-level singleton: clear its counters and stop it
+    # from limiting the apps created by later tests
+    limiter.reset()
+    limiter.initialized = False
 
 
 # ---------------------------------------------------------------------------
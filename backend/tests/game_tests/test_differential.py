@@ -0,0 +1,102 @@
+from utils import differential
+from utils.game import Game, collapse_list_left
+
+
+class NoChainEngine(Game):
+    """Sliding left stops after the first merge in each row."""
+    def left(self):
+        new_grid = []
+        for row in self._grid:
+            tiles = [cell for cell in row if cell != " "]
+            collapsed = collapse_list_left(tiles[:3]) + tiles[3:]
+            new_grid.append(collapsed + [" "] * (self._num_cols - len(collapsed)))
+        return new_grid
+
+
+def no_chain_game(seed):
+    game = differential.reference_game(seed)
+    game.__class__ = NoChainEngine
+    return game
+
+
+def test_reference_engine_agrees_with_itself():
+    assert differential.fuzz(differential.reference_game, games=20, max_moves=50) is None
+
+
+def invalid_opening_move():
+    """A seed and a move that is invalid on its opening board."""
+    for attempt in range(100):
+        seed = f"invalid-{attempt}"
+        invalid = sorted(set(differential.DIRECTIONS) - set(differential.reference_game(seed).get_valid_moves()))
+        if invalid:
+            return seed, invalid[0]
+    raise RuntimeError("No seed has an invalid opening move")
+
+
+def test_trace_skips_invalid_moves():
+    seed, move = invalid_opening_move()
+
+    snapshots = differential.trace(differential.reference_game, seed, [move])
+    assert len(snapshots) == 2
+    assert snapshots[0] == snapshots[1]
+
+
+def test_fuzz_finds_and_minimizes_divergence():
+    result = differential.fuzz(no_chain_game, games=200, max_moves=100)
+
+    assert result is not None
+    assert result["expected"] != result["actual"]
+    # The reproducer still diverges, and at its final move
+    assert differential.first_divergence(no_chain_game, result["seed"], result["moves"]) == len(result["moves"])
+    assert "left" in result["moves"]
+
+
+def test_candidate_exception_counts_as_divergence():
+    def broken(seed):
+        raise RuntimeError("boom")
+
+    assert differential.first_divergence(broken, "seed", ["up"]) == 0
+
+
+class RaisingEngine(Game):
+    """Sliding up crashes; every other move matches the reference."""
+    def slide_up(self):
+        raise RuntimeError("slide_up failed")
+
+
+def raising_game(seed):
+    game = differential.reference_game(seed)
+    game.__class__ = RaisingEngine
+    return game
+
+
+def replay_with_up_second():
+    """A seed and two valid moves, "up" second, so the candidate raises mid-game."""
+    for attempt in range(100):
+        seed = f"raise-{attempt}"
+        game = differential.reference_game(seed)
+        first = next((move for move in ("left", "right", "down") if move in game.get_valid_moves()), None)
+        if first is None:
+            continue
+        differential.apply_move(game, first)
+        game.generate_tiles()
+        if "up" in game.get_valid_moves():
+            return seed, [first, "up"]
+    raise RuntimeError("No seed allows a move followed by up")
+
+
+def test_candidate_raising_mid_game_diverges_at_that_move():
+    seed, moves = replay_with_up_second()
+
+    assert differential.first_divergence(raising_game, seed, moves + ["left"]) == 2
+    assert differential.minimize(raising_game, seed, moves + ["left"]) == moves
+    result = differential.describe(raising_game, seed, moves)
+    assert result["step"] == 2
+    assert result["actual"] == ("raised", "RuntimeError('slide_up failed')")
+    assert result["expected"] == differential.trace(differential.reference_game, seed, moves)[2]
+
+
+def test_describe_without_divergence():
+    result = differential.describe(differential.reference_game, "seed", ["up"])
+    assert result["step"] is None
+    assert result["expected"] is None and result["actual"] is None
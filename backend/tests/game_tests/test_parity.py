@@ -0,0 +1,56 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from tests.conftest import WON_GAME_1
+from utils import parity
+
+WON_MOVES = "".join(move[0] for move in WON_GAME_1["moves"])
+
+
+def python_record(seed, moves):
+    return {"seed": seed, "moves": moves, "digests": [digest for digest, _ in parity.digests(seed, moves)]}
+
+
+def test_digest_covers_board_and_rng_state():
+    record = python_record(WON_GAME_1["seed"], WON_MOVES[:5])
+
+    assert len(record["digests"]) == 6
+    assert all(len(digest) == 17 and digest[8] == ":" for digest in record["digests"])
+    assert len(set(record["digests"])) == 6
+
+
+def test_matching_corpus_has_no_divergence():
+    lines = [json.dumps(python_record(WON_GAME_1["seed"], WON_MOVES))]
+
+    games, steps, divergence = parity.check_corpus(lines)
+
+    assert (games, divergence) == (1, None)
+    assert steps == len(WON_MOVES) + 1
+
+
+def test_reports_first_divergent_step():
+    record = python_record(WON_GAME_1["seed"], WON_MOVES[:10])
+    record["digests"][4] = "00000000:" + record["digests"][4][9:]
+
+    divergence = parity.check_game(record)
+
+    assert divergence["step"] == 4
+    assert divergence["moves"] == WON_MOVES[:4]
+    assert divergence["expected"] != divergence["actual"]
+    assert divergence["python_board_before"] is not None
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+def test_python_matches_recorded_js_games():
+    output = subprocess.run(
+        ["node", parity.RECORDER, "--games", "5", "--max-moves", "100"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+
+    games, _, divergence = parity.check_corpus(output.splitlines())
+
+    assert games == 5
+    assert divergence is None
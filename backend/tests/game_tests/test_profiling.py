@@ -0,0 +1,60 @@
+import pytest
+
+from tests.conftest import WON_GAME_1
+from utils import game, profiling
+from utils.replay import simulate_game
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    # Install the wrappers for this test only and restore the originals afterwards
+    for owner, attr in profiling.HOT_PATHS:
+        monkeypatch.setattr(owner, attr, getattr(owner, attr))
+    monkeypatch.setattr(profiling, "_installed", False)
+    profiling.install()
+
+
+def test_wrappers_not_installed_by_default():
+    if profiling.ENABLED:
+        pytest.skip("ENGINE_PROFILE is set in this environment")
+    assert game.Game.slide_left.__module__ == "utils.game"
+    assert game.collapse_list_left.__module__ == "utils.game"
+
+
+def test_profiling_does_not_change_results(installed):
+    plain_result = simulate_game(WON_GAME_1["seed"], WON_GAME_1["moves"])
+
+    with profiling.profile_replay(use_cprofile=False):
+        profiled_result = simulate_game(WON_GAME_1["seed"], WON_GAME_1["moves"])
+
+    assert profiled_result == plain_result == (True, "Won")
+
+
+def test_profile_replay_collects_folded_stacks(installed):
+    moves = WON_GAME_1["moves"][:20]
+
+    with profiling.profile_replay(use_cprofile=False) as report:
+        simulate_game(WON_GAME_1["seed"], moves)
+
+    folded = report["folded"]
+    assert report["seconds"] > 0
+    assert folded["Game.generate_tiles"][0] == len(moves) + 1
+    assert "Game.slide_left;collapse_list_left" in folded
+    assert "Game.generate_tiles;DeterministicRNG.sample" in folded
+    assert "collapse_list_left" in profiling.format_summary(report)
+    assert profiling.format_folded(report).splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+
+def test_wrappers_do_not_collect_outside_profile_replay(installed):
+    with profiling.profile_replay(use_cprofile=False) as report:
+        pass
+    simulate_game(WON_GAME_1["seed"], WON_GAME_1["moves"][:5])
+
+    assert report["folded"] == {}
+
+
+def test_cprofile_output_when_sampled(installed):
+    with profiling.profile_replay(use_cprofile=True) as report:
+        simulate_game(WON_GAME_1["seed"], WON_GAME_1["moves"][:5])
+
+    assert "generate_tiles" in report["pstats"]
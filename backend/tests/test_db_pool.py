@@ -0,0 +1,62 @@
+"""test_db_pool.py — engine pool configuration and checkout metrics."""
+import pytest
+from sqlalchemy import create_engine, exc
+
+from db_pool import TimedQueuePool, engine_options_from_env, pool_metrics
+
+
+def test_sqlite_uses_default_pool():
+    assert engine_options_from_env("sqlite:///:memory:") == {}
+    assert engine_options_from_env(None) == {}
+
+
+def test_postgres_options_read_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "12")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+
+    options = engine_options_from_env("postgresql://user:pw@localhost/db")
+
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == 12
+    assert options["max_overflow"] == 3
+    assert options["pool_timeout"] == 2.5
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_postgres_defaults_enable_pre_ping(monkeypatch):
+    monkeypatch.delenv("DB_POOL_PRE_PING", raising=False)
+    monkeypatch.delenv("DB_STATEMENT_TIMEOUT_MS", raising=False)
+
+    options = engine_options_from_env("postgresql://user:pw@localhost/db")
+
+    assert options["pool_pre_ping"] is True
+    assert "connect_args" not in options
+
+
+def test_timed_pool_records_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    before = pool_metrics.snapshot()
+
+    conn = engine.connect()
+    assert pool_metrics.snapshot()["checked_out"] == 1
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    conn.close()
+
+    after = pool_metrics.snapshot()
+    assert after["checkouts"] == before["checkouts"] + 1
+    assert after["timeouts"] == before["timeouts"] + 1
+    assert after["checked_out"] == 0
+    engine.dispose()
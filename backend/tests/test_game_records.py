@@ -0,0 +1,136 @@
+import time
+import pytest
+from app import create_app
+from extensions import db
+from game_records import GameRecorder, decode_moves, encode_moves, replay_matches
+from models.game_record import MAX_SEED_LENGTH, GameRecord
+from tests.conftest import ABANDONED_GAME_1, LOST_GAME_1, WON_GAME_1
+
+
+def recorder(app) -> GameRecorder:
+    return app.extensions["game_recorder"]
+
+
+def records() -> list[GameRecord]:
+    return GameRecord.query.order_by(GameRecord.id).all()
+
+
+def test_moves_round_trip_compressed():
+    moves = WON_GAME_1["moves"]
+    blob = encode_moves(moves)
+
+    assert decode_moves(blob) == moves
+    assert len(blob) < len(moves) / 2
+
+
+def test_replay_matches():
+    assert replay_matches("Won", (True, "Won"))
+    assert not replay_matches("Won", (True, "Lost"))
+    assert replay_matches("Abandoned", (True, "In Progress"))
+    assert replay_matches("Invalid", (False, None))
+    assert not replay_matches("Invalid", (True, "Lost"))
+
+
+def test_verify_queues_record_until_flush(app, client):
+    user_id = client.get("/api/statistics").get_json()["user_id"]
+    client.post("/api/verify", json=WON_GAME_1)
+
+    assert records() == []
+    assert recorder(app).flush() == 1
+    [record] = records()
+    assert record.user_id == user_id
+    assert record.seed == WON_GAME_1["seed"]
+    assert record.result == "Won"
+    assert record.num_moves == len(WON_GAME_1["moves"])
+    assert decode_moves(record.moves) == WON_GAME_1["moves"]
+    assert record.verify_ms >= 0
+
+
+def test_each_outcome_is_recorded_once(app, client):
+    client.post("/api/verify", json=LOST_GAME_1)
+    client.post("/api/verify", json=LOST_GAME_1)  # duplicate: not counted, not recorded
+    client.post("/api/restart", json={"seed": ABANDONED_GAME_1["seed"], "moves": ABANDONED_GAME_1["moves"][:5]})
+    client.post("/api/verify", json={"seed": "not-a-real-game", "moves": ["up"]})
+
+    recorder(app).flush()
+    assert [record.result for record in records()] == ["Lost", "Abandoned", "Invalid"]
+
+
+def test_flush_with_nothing_queued(app):
+    assert recorder(app).flush() == 0
+
+
+def test_full_queue_drops_new_records(app):
+    game_recorder = GameRecorder(app, db, batch_size=10, flush_seconds=60, max_pending=2)
+    for _ in range(3):
+        game_recorder.record("user", "seed", ["up"], "Won", 0.001)
+
+    assert len(game_recorder) == 2
+    assert game_recorder.dropped == 1
+    assert game_recorder.flush() == 2
+    assert game_recorder.dropped == 0
+
+
+def test_zero_max_pending_disables_history(app):
+    game_recorder = GameRecorder(app, db, batch_size=10, flush_seconds=60, max_pending=0)
+    game_recorder.record("user", "seed", ["up"], "Won", 0.001)
+
+    assert len(game_recorder) == 0
+    assert game_recorder.dropped == 0
+
+
+def test_flush_inserts_in_batches(app):
+    game_recorder = GameRecorder(app, db, batch_size=2, flush_seconds=60, max_pending=100)
+    for i in range(5):
+        game_recorder.record(f"user-{i}", "seed", ["up", "left"], "Lost", 0.001)
+
+    assert game_recorder.flush() == 5
+    assert [record.user_id for record in records()] == [f"user-{i}" for i in range(5)]
+
+
+def test_batch_size_must_be_positive(app):
+    with pytest.raises(ValueError, match="GAME_RECORD_BATCH_SIZE"):
+        GameRecorder(app, db, batch_size=0, flush_seconds=60, max_pending=100)
+
+
+def test_overlong_seed_is_rejected_and_not_recorded(app, client):
+    res = client.post("/api/verify", json={"seed": "s" * (MAX_SEED_LENGTH + 1), "moves": []})
+
+    assert res.status_code == 400
+    assert recorder(app).flush() == 0
+
+
+def test_background_thread_writes_full_batch(tmp_path):
+    flask_app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'records.db'}",
+        "SECRET_KEY": "test-secret-key",
+    })
+    with flask_app.app_context():
+        db.create_all()
+        game_recorder = GameRecorder(flask_app, db, batch_size=2, flush_seconds=60, max_pending=100)
+        game_recorder.start()
+        game_recorder.record("user-1", "seed", ["up"], "Won", 0.001)
+        game_recorder.record("user-2", "seed", ["up"], "Won", 0.001)
+
+        deadline = time.monotonic() + 5
+        while GameRecord.query.count() < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            db.session.rollback()
+        assert GameRecord.query.count() == 2
+        db.drop_all()
+
+
+def test_audit_games_command(app, client):
+    client.post("/api/verify", json=WON_GAME_1)
+    recorder(app).flush()
+    runner = app.test_cli_runner()
+
+    assert "Replayed 1 games, 0 mismatches" in runner.invoke(args=["audit-games"]).output
+
+    record = records()[0]
+    record.result = "Lost"
+    db.session.commit()
+    result = runner.invoke(args=["audit-games"])
+    assert "recorded Lost, replays as True/Won" in result.output
+    assert "1 mismatches" in result.output
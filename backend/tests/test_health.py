@@ -0,0 +1,53 @@
+"""test_health.py — /healthz and /readyz probes."""
+from unittest.mock import patch
+
+from extensions import db, limiter
+from models.user import User
+from routes.health import check_readiness
+
+HEALTH_URL = "/healthz"
+READY_URL = "/readyz"
+
+
+def test_healthz_ok(client):
+    res = client.get(HEALTH_URL)
+    assert res.status_code == 200
+    assert res.get_json() == {"status": "ok"}
+
+
+def test_readyz_ok_without_limiter(client):
+    res = client.get(READY_URL)
+
+    assert res.status_code == 200
+    assert res.get_json() == {
+        "status": "ready",
+        "checks": {"database": "ok", "limiter": "disabled"},
+    }
+
+
+def test_readyz_checks_limiter_storage(limiter_client):
+    res = limiter_client.get(READY_URL)
+    assert res.get_json()["checks"]["limiter"] == "ok"
+
+
+def test_readyz_does_not_create_user(client):
+    client.get(READY_URL)
+    client.get(HEALTH_URL)
+    assert db.session.query(User).count() == 0
+
+
+def test_readyz_reports_unavailable_database(app, client):
+    with patch.object(db.engine, "connect", side_effect=RuntimeError("down")):
+        res = client.get(READY_URL)
+
+    assert res.status_code == 503
+    assert res.get_json()["checks"]["database"] == "unavailable"
+
+
+def test_readyz_result_is_cached(app, client):
+    app.config["READINESS_CACHE_SECONDS"] = 60
+    with patch("routes.health.check_readiness", wraps=check_readiness) as spy:
+        client.get(READY_URL)
+        client.get(READY_URL)
+        client.get(READY_URL)
+    assert spy.call_count == 1
@@ -0,0 +1,86 @@
+"""test_idempotency.py — repeated POSTs to /api/verify and /api/restart."""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from extensions import db, limiter
+from models.idempotency_key import IdempotencyKey
+from tests.conftest import ABANDONED_GAME_1, LOST_GAME_1, WON_GAME_2
+
+VERIFY_URL = "/api/verify"
+RESTART_URL = "/api/restart"
+IN_PROGRESS = {"seed": ABANDONED_GAME_1["seed"], "moves": ABANDONED_GAME_1["moves"][:5]}
+
+
+def test_retried_restart_counts_once(client):
+    first = client.post(RESTART_URL, json=IN_PROGRESS)
+    second = client.post(RESTART_URL, json=IN_PROGRESS)
+
+    assert second.status_code == 200
+    assert second.get_json() == first.get_json()
+    assert second.get_json()["abandoned"] == 1
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+
+def test_retry_does_not_run_the_view(client):
+    client.post(RESTART_URL, json=IN_PROGRESS)
+    with patch("routes.solo.run_replay") as run_replay:
+        client.post(RESTART_URL, json=IN_PROGRESS)
+    run_replay.assert_not_called()
+
+
+def test_header_key_overrides_body_digest(client):
+    client.post(VERIFY_URL, json=WON_GAME_2, headers={"Idempotency-Key": "game-1"})
+    res = client.post(VERIFY_URL, json=LOST_GAME_1, headers={"Idempotency-Key": "game-1"})
+
+    assert res.get_json()["losses"] == 0
+    assert res.get_json()["wins"] == 1
+
+
+def test_distinct_header_keys_are_processed(client):
+    client.post(RESTART_URL, json=IN_PROGRESS, headers={"Idempotency-Key": "a"})
+    res = client.post(RESTART_URL, json=IN_PROGRESS, headers={"Idempotency-Key": "b"})
+
+    # Processed again, and the seed registry keeps it from counting twice
+    assert "Idempotent-Replayed" not in res.headers
+    assert res.get_json()["message"] == "Game already submitted"
+    assert res.get_json()["abandoned"] == 1
+
+
+def test_invalid_header_returns_400(client):
+    res = client.post(VERIFY_URL, json=WON_GAME_2, headers={"Idempotency-Key": "x" * 256})
+    assert res.status_code == 400
+
+
+def test_errors_are_not_stored(client):
+    client.post(VERIFY_URL, json={"moves": []})
+    assert db.session.query(IdempotencyKey).count() == 0
+
+
+def test_expired_key_is_processed_again(client):
+    client.post(RESTART_URL, json=IN_PROGRESS)
+    db.session.query(IdempotencyKey).update({"created_at": datetime.now() - timedelta(days=2)})
+    db.session.commit()
+
+    res = client.post(RESTART_URL, json=IN_PROGRESS)
+    assert "Idempotent-Replayed" not in res.headers
+    assert db.session.query(IdempotencyKey).count() == 1
+
+
+def test_disabled_with_zero_ttl(app, client):
+    app.config["IDEMPOTENCY_TTL_SECONDS"] = 0
+    client.post(RESTART_URL, json=IN_PROGRESS)
+    res = client.post(RESTART_URL, json=IN_PROGRESS)
+    assert "Idempotent-Replayed" not in res.headers
+    assert db.session.query(IdempotencyKey).count() == 0
+
+
+def test_retry_is_rate_limited_then_replayed(limiter_client):
+    limiter.reset()
+    limiter_client.post(RESTART_URL, json=IN_PROGRESS)
+    # Identical bodies still count against the limit
+    assert limiter_client.post(RESTART_URL, json=IN_PROGRESS).status_code == 429
+
+    limiter.reset()
+    res = limiter_client.post(RESTART_URL, json=IN_PROGRESS)
+    assert res.status_code == 200
+    assert res.headers["Idempotent-Replayed"] == "true"
@@ -0,0 +1,67 @@
+import datetime
+import decimal
+import uuid
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from json_provider import OrjsonProvider
+
+pytest.importorskip("orjson")
+
+SAMPLE = {
+    "user_id": str(uuid.uuid4()),
+    "wins": 3,
+    "moves": ["up", "down", "left", "right"] * 50,
+    "nested": {"b": 1.5, "a": None, "c": [True, False]},
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "when": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    "amount": decimal.Decimal("1.10"),
+}
+
+
+def make_app(provider):
+    return create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SECRET_KEY": "test-secret-key",
+        "JSON_PROVIDER": provider,
+    })
+
+
+def test_orjson_is_default(app):
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_stdlib_provider_can_be_selected():
+    assert type(make_app("stdlib").json) is DefaultJSONProvider
+
+
+def test_orjson_output_matches_stdlib():
+    orjson_app, stdlib_app = make_app("orjson"), make_app("stdlib")
+
+    assert orjson_app.json.dumps(SAMPLE) == stdlib_app.json.dumps(SAMPLE, separators=(",", ":"))
+    with orjson_app.app_context():
+        fast = orjson_app.json.response(SAMPLE)
+    with stdlib_app.app_context():
+        default = stdlib_app.json.response(SAMPLE)
+    assert fast.get_data() == default.get_data()
+    assert fast.mimetype == default.mimetype == "application/json"
+
+
+def test_orjson_loads_matches_stdlib():
+    orjson_app, stdlib_app = make_app("orjson"), make_app("stdlib")
+    text = stdlib_app.json.dumps({"seed": "abc", "moves": ["up", "left"] * 1000})
+
+    assert orjson_app.json.loads(text) == stdlib_app.json.loads(text)
+    assert orjson_app.json.loads(text.encode()) == stdlib_app.json.loads(text)
+
+
+def test_malformed_body_is_rejected_like_stdlib(client):
+    res = client.post("/api/verify", data=b'{"seed": "abc", "moves": [', content_type="application/json")
+    assert res.status_code == 400
+    assert res.is_json
+
+
+def test_session_cookie_round_trips(client):
+    user_id = client.get("/api/statistics").get_json()["user_id"]
+    assert client.get("/api/statistics").get_json()["user_id"] == user_id
@@ -0,0 +1,139 @@
+import uuid
+import pytest
+from background import job_lock
+from extensions import db
+from leaderboard import refresh_leaderboard, refresh_leaderboards
+from models.leaderboard import LeaderboardEntry
+from models.user import User
+from tests.conftest import WON_GAME_1
+
+LEADERBOARD_URL = "/api/leaderboard"
+
+
+def add_user(wins=0, losses=0, abandoned=0, best_win_moves=None) -> str:
+    user_id = str(uuid.uuid4())
+    db.session.add(User(
+        user_id=user_id,
+        num_wins=wins,
+        num_losses=losses,
+        num_abandoned_games=abandoned,
+        best_win_moves=best_win_moves,
+    ))
+    db.session.commit()
+    return user_id
+
+
+def ranks(board: str) -> dict[str, int]:
+    return {entry.user_id: entry.rank for entry in LeaderboardEntry.query.filter_by(board=board)}
+
+
+def test_wins_board_ranks_by_wins_with_shared_ties(client):
+    first = add_user(wins=5)
+    tied = [add_user(wins=3), add_user(wins=3)]
+    last = add_user(wins=1)
+    add_user(wins=0, losses=4)
+
+    assert refresh_leaderboard(db, "wins", min_games=10) == 4
+    assert ranks("wins") == {first: 1, tied[0]: 2, tied[1]: 2, last: 4}
+
+
+def test_win_rate_board_requires_min_games(client):
+    steady = add_user(wins=8, losses=2)
+    lucky = add_user(wins=1)
+    weaker = add_user(wins=5, losses=3, abandoned=2)
+
+    refresh_leaderboard(db, "win_rate", min_games=10)
+    assert ranks("win_rate") == {steady: 1, weaker: 2}
+    assert lucky not in ranks("win_rate")
+
+
+def test_fastest_win_board_ranks_fewest_moves_first(client):
+    slow = add_user(wins=1, best_win_moves=400)
+    fast = add_user(wins=1, best_win_moves=150)
+    add_user(losses=1)
+
+    refresh_leaderboard(db, "fastest_win", min_games=10)
+    assert ranks("fastest_win") == {fast: 1, slow: 2}
+
+
+def test_refresh_replaces_previous_ranking(client):
+    user_id = add_user(wins=1)
+    refresh_leaderboard(db, "wins", min_games=10)
+    db.session.delete(db.session.get(User, user_id))
+    db.session.commit()
+
+    assert refresh_leaderboard(db, "wins", min_games=10) == 0
+    assert ranks("wins") == {}
+
+
+def test_endpoint_returns_top_entries_and_own_rank(client):
+    own_id = client.get("/api/statistics").get_json()["user_id"]
+    user = db.session.get(User, own_id)
+    user.num_wins = 2
+    db.session.commit()
+    leaders = [add_user(wins=10 - i) for i in range(5)]
+    refresh_leaderboards(client.application, db)
+
+    res = client.get(f"{LEADERBOARD_URL}/wins?limit=3")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["total"] == 6
+    assert data["refreshed_at"] is not None
+    assert [entry["player"] for entry in data["entries"]] == [user_id[:8] for user_id in leaders[:3]]
+    assert [entry["value"] for entry in data["entries"]] == [10, 9, 8]
+    assert not any(entry["you"] for entry in data["entries"])
+    assert data["you"] == {"rank": 6, "player": own_id[:8], "value": 2, "you": True}
+
+
+def test_endpoint_before_first_refresh(client):
+    data = client.get(f"{LEADERBOARD_URL}/fastest_win").get_json()
+    assert data == {"board": "fastest_win", "refreshed_at": None, "total": 0, "entries": [], "you": None}
+
+
+def test_unknown_board_returns_404(client):
+    assert client.get(f"{LEADERBOARD_URL}/losses").status_code == 404
+
+
+@pytest.mark.parametrize("limit", ["0", "101", "-1", "ten"])
+def test_invalid_limit_returns_400(client, limit):
+    assert client.get(f"{LEADERBOARD_URL}/wins?limit={limit}").status_code == 400
+
+
+def test_verified_win_records_fewest_moves(client):
+    user_id = client.get("/api/statistics").get_json()["user_id"]
+    client.post("/api/verify", json=WON_GAME_1)
+
+    assert db.session.get(User, user_id).best_win_moves == len(WON_GAME_1["moves"])
+
+
+def test_refresh_leaderboards_command(app, client):
+    add_user(wins=1)
+    result = app.test_cli_runner().invoke(args=["refresh-leaderboards"])
+
+    assert result.exit_code == 0
+    assert "Ranked 1 players on the wins leaderboard" in result.output
+
+
+def test_refresh_leaderboards_command_skips_when_lock_held(app, tmp_path):
+    app.config["SCHEDULER_LOCK_FILE"] = str(tmp_path / "jobs.lock")
+    add_user(wins=1)
+    with job_lock(app, db):
+        result = app.test_cli_runner().invoke(args=["refresh-leaderboards", "--force"])
+
+    assert "Refresh skipped" in result.output
+    assert db.session.query(LeaderboardEntry).count() == 0
+
+
+def test_refresh_leaderboards_command_skips_fresh_boards_unless_forced(app, tmp_path):
+    app.config["SCHEDULER_LOCK_FILE"] = str(tmp_path / "jobs.lock")
+    add_user(wins=1)
+    refresh_leaderboards(app, db)
+    runner = app.test_cli_runner()
+
+    assert "Refresh skipped" in runner.invoke(args=["refresh-leaderboards"]).output
+    assert "Ranked 1 players" in runner.invoke(args=["refresh-leaderboards", "--force"]).output
+
+
+def test_ranked_columns_are_indexed():
+    indexed = {column for index in User.__table__.indexes for column in index.columns.keys()}
+    assert {"num_wins", "best_win_moves"} <= indexed
@@ -0,0 +1,90 @@
+"""test_limiter_storage.py — host-local shared limiter storage and limiter config."""
+import time
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from limiter_storage import LocalSQLiteStorage, limiter_config_from_env
+
+
+@pytest.fixture
+def storage_uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'limits.db'}"
+
+
+def test_sqlite_scheme_is_registered(storage_uri):
+    assert isinstance(storage_from_string(storage_uri), LocalSQLiteStorage)
+
+
+def test_incr_get_and_clear(storage_uri):
+    storage = LocalSQLiteStorage(storage_uri)
+
+    assert storage.incr("k", 10) == 1
+    assert storage.incr("k", 10, amount=2) == 3
+    assert storage.get("k") == 3
+    assert storage.get_expiry("k") > time.time()
+
+    storage.clear("k")
+    assert storage.get("k") == 0
+
+
+def test_expired_window_restarts_count(storage_uri):
+    storage = LocalSQLiteStorage(storage_uri)
+    storage.incr("k", 1)
+    storage.incr("k", 1)
+
+    time.sleep(1.05)
+
+    assert storage.get("k") == 0
+    before = time.time()
+    assert storage.get_expiry("k") >= before
+    assert storage.incr("k", 1) == 1
+
+
+def test_counters_are_shared_between_workers(storage_uri):
+    """Two storage instances on the same file behave like two gunicorn workers."""
+    worker_a = FixedWindowRateLimiter(LocalSQLiteStorage(storage_uri))
+    worker_b = FixedWindowRateLimiter(LocalSQLiteStorage(storage_uri))
+    limit = parse("2 per second")
+
+    assert worker_a.hit(limit, "user") is True
+    assert worker_b.hit(limit, "user") is True
+    assert worker_a.hit(limit, "user") is False
+
+
+def test_reset_and_check(storage_uri):
+    storage = LocalSQLiteStorage(storage_uri)
+    storage.incr("a", 10)
+    storage.incr("b", 10)
+
+    assert storage.check() is True
+    assert storage.reset() == 2
+    assert storage.get("a") == 0
+
+
+def test_config_defaults_to_memory(monkeypatch):
+    monkeypatch.delenv("RATELIMIT_STORAGE_URI", raising=False)
+    monkeypatch.delenv("REDIS_URL", raising=False)
+
+    assert limiter_config_from_env() == {"RATELIMIT_STORAGE_URI": "memory://"}
+
+
+def test_config_redis_bounds_latency_and_falls_back(monkeypatch):
+    monkeypatch.delenv("RATELIMIT_STORAGE_URI", raising=False)
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+    monkeypatch.setenv("RATELIMIT_REDIS_TIMEOUT", "0.1")
+
+    config = limiter_config_from_env()
+
+    assert config["RATELIMIT_STORAGE_URI"] == "redis://localhost:6379"
+    assert config["RATELIMIT_STORAGE_OPTIONS"]["socket_timeout"] == 0.1
+    assert config["RATELIMIT_IN_MEMORY_FALLBACK_ENABLED"] is True
+
+
+def test_config_explicit_storage_uri_wins(monkeypatch, storage_uri):
+    monkeypatch.setenv("RATELIMIT_STORAGE_URI", storage_uri)
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+
+    assert limiter_config_from_env()["RATELIMIT_STORAGE_URI"] == storage_uri
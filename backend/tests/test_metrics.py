@@ -0,0 +1,92 @@
+"""test_metrics.py — Prometheus /metrics endpoint and request instrumentation."""
+import pytest
+from prometheus_client import REGISTRY
+
+from extensions import db, limiter
+from models.user import User
+from tests.conftest import WON_GAME_1
+
+METRICS_URL = "/metrics"
+AUTH = {"Authorization": "Bearer secret"}
+
+
+@pytest.fixture(autouse=True)
+def metrics_token(app):
+    app.config["METRICS_TOKEN"] = "secret"
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_endpoint_serves_prometheus_text(client):
+    client.get("/api/statistics")
+
+    res = client.get(METRICS_URL, headers=AUTH)
+
+    assert res.status_code == 200
+    assert res.content_type.startswith("text/plain")
+    assert b"http_request_duration_seconds" in res.data
+
+
+def test_metrics_does_not_create_user(client):
+    client.get(METRICS_URL, headers=AUTH)
+    assert db.session.query(User).count() == 0
+
+
+def test_request_latency_and_db_queries_recorded(client):
+    before = _sample("http_request_duration_seconds_count", endpoint="get_statistics", method="GET", status="200")
+    queries_before = _sample("http_request_db_queries_sum", endpoint="get_statistics")
+
+    client.get("/api/statistics")
+
+    assert _sample("http_request_duration_seconds_count", endpoint="get_statistics", method="GET", status="200") == before + 1
+    assert _sample("http_request_db_queries_sum", endpoint="get_statistics") > queries_before
+
+
+def test_replay_duration_and_moves_recorded(client):
+    before = _sample("replay_simulation_seconds_count", endpoint="verify_game")
+    moves_before = _sample("replay_moves_sum", endpoint="verify_game")
+
+    client.post("/api/verify", json=WON_GAME_1)
+
+    assert _sample("replay_simulation_seconds_count", endpoint="verify_game") == before + 1
+    assert _sample("replay_moves_sum", endpoint="verify_game") == moves_before + len(WON_GAME_1["moves"])
+
+
+def test_limiter_rejections_counted(limiter_client):
+    limiter.reset()
+    before = _sample("rate_limit_rejections_total", endpoint="verify_game")
+
+    limiter_client.post("/api/verify", json={"seed": "test-seed", "moves": []})
+    limiter_client.post("/api/verify", json={"seed": "test-seed", "moves": []})
+
+    assert _sample("rate_limit_rejections_total", endpoint="verify_game") == before + 1
+
+
+def test_default_limit_rejections_counted_and_timed(limiter_client):
+    """A 429 from the default limit (raised in before_request) is counted and timed."""
+    limiter_client.get("/api/statistics")  # a session, so every call below shares one key
+    limiter.reset()
+    labels = {"endpoint": "get_leaderboard"}
+    before = _sample("rate_limit_rejections_total", **labels)
+    timed_before = _sample("http_request_duration_seconds_count", method="GET", status="429", **labels)
+
+    statuses = [limiter_client.get("/api/leaderboard/wins").status_code for _ in range(4)]
+
+    assert statuses == [200, 200, 429, 429]
+    assert _sample("rate_limit_rejections_total", **labels) == before + 2
+    assert _sample("http_request_duration_seconds_count", method="GET", status="429", **labels) == timed_before + 2
+
+
+def test_metrics_token_required_when_configured(app, client):
+    assert client.get(METRICS_URL).status_code == 401
+    assert client.get(METRICS_URL, headers=AUTH).status_code == 200
+
+
+def test_metrics_hidden_without_token_unless_public(app, client):
+    app.config["METRICS_TOKEN"] = None
+    assert client.get(METRICS_URL).status_code == 404
+
+    app.config["METRICS_PUBLIC"] = True
+    assert client.get(METRICS_URL).status_code == 200
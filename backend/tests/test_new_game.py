@@ -0,0 +1,67 @@
+"""test_new_game.py — POST /api/game/new and server-issued openings."""
+import uuid
+from unittest.mock import patch
+
+from openings import OpeningPool
+from routes import solo
+from tests.conftest import LOST_GAME_1, WON_GAME_1, build_replay
+from utils.replay import opening_state, simulate_game
+
+NEW_GAME_URL = "/api/game/new"
+
+
+def test_new_game_issues_uuid_seed(client):
+    res = client.post(NEW_GAME_URL)
+    assert res.status_code == 200
+    seed = res.get_json()["seed"]
+    assert str(uuid.UUID(seed, version=4)) == seed
+
+
+def test_new_game_seeds_are_unique(client):
+    seeds = {client.post(NEW_GAME_URL).get_json()["seed"] for _ in range(5)}
+    assert len(seeds) == 5
+
+
+def test_issued_seed_verifies_from_stored_opening(client):
+    seed = client.post(NEW_GAME_URL).get_json()["seed"]
+    replay = build_replay(seed, exact_moves=5)
+
+    with patch("routes.solo.run_replay", wraps=solo.run_replay) as run_replay:
+        res = client.post("/api/restart", json=replay)
+
+    assert res.get_json()["abandoned"] == 1
+    assert run_replay.call_args.args[2] == opening_state(seed)
+
+
+def test_client_seed_still_verifies_without_opening(client):
+    replay = build_replay("client-chosen-seed", exact_moves=5)
+
+    with patch("routes.solo.run_replay", wraps=solo.run_replay) as run_replay:
+        res = client.post("/api/restart", json=replay)
+
+    assert res.get_json()["abandoned"] == 1
+    assert run_replay.call_args.args[2] is None
+
+
+def test_pool_serves_prebuilt_openings():
+    pool = OpeningPool(pool_size=4, cache_size=10)
+    pool.refill()
+
+    seed = pool.issue()
+
+    assert pool.get(seed) == opening_state(seed)
+
+
+def test_pool_cache_is_bounded():
+    pool = OpeningPool(pool_size=0, cache_size=2)
+    seeds = [pool.issue() for _ in range(3)]
+
+    assert len(pool) == 2
+    assert pool.get(seeds[0]) is None
+    assert pool.get(seeds[2]) is not None
+
+
+def test_restored_opening_replays_identically():
+    for replay in (WON_GAME_1, LOST_GAME_1):
+        opening = opening_state(replay["seed"])
+        assert simulate_game(replay["seed"], replay["moves"], opening) == simulate_game(replay["seed"], replay["moves"])
@@ -4,18 +4,21 @@ Limits under test
 -----------------
 /api/verify    : 1 per 10 seconds  (route-level @limiter.limit)
 /api/restart   : 1 per 10 seconds  (route-level @limiter.limit)
-/api/statistics: 2 per second      (default_limits on Limiter instance)
+/api/leaderboard/<board>: 2 per second  (default_limits on Limiter instance)
+/api/statistics: exempt once a session exists (tests/test_route_policy.py)
 
 Tests marked @pytest.mark.slow exercise the real time windows and add
 ~10 s or ~1 s to the suite run.  Skip them with:  pytest -m "not slow"
 """
 import time
+from unittest.mock import patch
 import pytest
 from extensions import limiter
 
 VERIFY_URL = "/api/verify"
 RESTART_URL = "/api/restart"
 STATS_URL = "/api/statistics"
+LEADERBOARD_URL = "/api/leaderboard/wins"
 
 # Minimal valid POST body — passes parse_seed_and_moves without 400
 _BODY = {"seed": "test-seed", "moves": []}
@@ -27,6 +30,9 @@ _BODY = {"seed": "test-seed", "moves": []}
 
 @pytest.fixture(autouse=True)
 def _reset_limiter(limiter_client):
+    # Limits are keyed by user once a session exists; start every test with one
+    # so all of its calls share a key
+    limiter_client.get(STATS_URL)
     limiter.reset()
     yield
 
@@ -53,6 +59,17 @@ def test_verify_after_reset_returns_200(limiter_client):
     assert res.status_code == 200
 
 
+def test_rejected_verify_is_not_parsed_or_looked_up(limiter_client):
+    """The limit is checked before the body is read or the idempotency store queried."""
+    limiter_client.post(VERIFY_URL, json=_BODY)
+    with patch("routes.request_body.read_request_json") as read_body, \
+            patch("routes.idempotency.storage_key") as storage_key:
+        res = limiter_client.post(VERIFY_URL, json=_BODY)
+    assert res.status_code == 429
+    read_body.assert_not_called()
+    storage_key.assert_not_called()
+
+
 @pytest.mark.slow
 def test_verify_after_time_interval_returns_200(limiter_client):
     limiter_client.post(VERIFY_URL, json=_BODY)
@@ -92,29 +109,29 @@ def test_restart_after_time_interval_returns_200(limiter_client):
 
 
 # ===========================================================================
-# /api/statistics — 2 per second (default limit)
+# /api/leaderboard — 2 per second (default limit)
 # ===========================================================================
 
-def test_statistics_allows_two_calls(limiter_client):
-    res1 = limiter_client.get(STATS_URL)
-    res2 = limiter_client.get(STATS_URL)
+def test_default_limit_allows_two_calls(limiter_client):
+    res1 = limiter_client.get(LEADERBOARD_URL)
+    res2 = limiter_client.get(LEADERBOARD_URL)
     assert res1.status_code == 200
     assert res2.status_code == 200
 
 
-def test_statistics_third_call_returns_429(limiter_client):
-    limiter_client.get(STATS_URL)
-    limiter_client.get(STATS_URL)
-    res = limiter_client.get(STATS_URL)
+def test_default_limit_third_call_returns_429(limiter_client):
+    limiter_client.get(LEADERBOARD_URL)
+    limiter_client.get(LEADERBOARD_URL)
+    res = limiter_client.get(LEADERBOARD_URL)
     assert res.status_code == 429
 
 
 @pytest.mark.slow
-def test_statistics_resets_after_one_second(limiter_client):
-    limiter_client.get(STATS_URL)
-    limiter_client.get(STATS_URL)
+def test_default_limit_resets_after_one_second(limiter_client):
+    limiter_client.get(LEADERBOARD_URL)
+    limiter_client.get(LEADERBOARD_URL)
     time.sleep(1.1)
-    res = limiter_client.get(STATS_URL)
+    res = limiter_client.get(LEADERBOARD_URL)
     assert res.status_code == 200
 
 
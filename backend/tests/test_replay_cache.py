@@ -0,0 +1,49 @@
+from replay_cache import ReplayCache, replay_digest
+
+
+def test_digest_depends_on_seed_and_moves():
+    assert replay_digest("a", ["up"]) == replay_digest("a", ["up"])
+    assert replay_digest("a", ["up"]) != replay_digest("b", ["up"])
+    assert replay_digest("a", ["up"]) != replay_digest("a", ["up", "up"])
+
+
+def test_evicts_least_recently_used():
+    cache = ReplayCache(max_entries=2)
+    cache.put(b"a", (True, "Won"))
+    cache.put(b"b", (True, "Lost"))
+    cache.get(b"a")
+    cache.put(b"c", (False, None))
+
+    assert len(cache) == 2
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == (True, "Won")
+
+
+def test_applied_users_are_tracked_per_entry():
+    cache = ReplayCache(max_entries=2)
+    cache.put(b"a", (True, "Won"))
+    cache.mark_applied(b"a", "user-1", (True, "Won"))
+
+    assert cache.is_applied(b"a", "user-1")
+    assert not cache.is_applied(b"a", "user-2")
+    assert not cache.is_applied(b"b", "user-1")
+
+
+def test_mark_applied_restores_evicted_entry():
+    cache = ReplayCache(max_entries=1)
+    cache.put(b"a", (True, "Won"))
+    cache.put(b"b", (True, "Lost"))  # evicts a before it is marked
+    cache.mark_applied(b"a", "user-1", (True, "Won"))
+
+    assert cache.is_applied(b"a", "user-1")
+    assert cache.get(b"a") == (True, "Won")
+    assert len(cache) == 1
+
+
+def test_zero_size_disables_cache():
+    cache = ReplayCache(max_entries=0)
+    cache.put(b"a", (True, "Won"))
+    cache.mark_applied(b"a", "user-1", (True, "Won"))
+
+    assert cache.get(b"a") is None
+    assert not cache.is_applied(b"a", "user-1")
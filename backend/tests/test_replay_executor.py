@@ -0,0 +1,42 @@
+import pytest
+import replay_executor
+from app import create_app
+from extensions import db
+from tests.conftest import LOST_GAME_1, WON_GAME_1
+
+
+@pytest.fixture
+def pooled_client():
+    flask_app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SECRET_KEY": "test-secret-key",
+        "REPLAY_WORKERS": 1,
+    })
+    with flask_app.app_context():
+        db.create_all()
+        with flask_app.test_client() as c:
+            yield c
+        db.drop_all()
+    replay_executor.shutdown()
+
+
+def test_inline_by_default(app):
+    assert replay_executor.simulate(WON_GAME_1["seed"], WON_GAME_1["moves"]) == (True, "Won")
+    assert replay_executor._executor is None
+
+
+def test_verify_replays_in_process_pool(pooled_client):
+    res = pooled_client.post("/api/verify", json=WON_GAME_1)
+    assert res.status_code == 200
+    assert res.get_json()["wins"] == 1
+    assert replay_executor._executor is not None
+
+    res = pooled_client.post("/api/verify", json=LOST_GAME_1)
+    assert res.get_json()["losses"] == 1
+
+
+def test_invalid_replay_through_pool(pooled_client):
+    res = pooled_client.post("/api/verify", json={"seed": WON_GAME_1["seed"], "moves": ["up"] * 3})
+    assert res.status_code == 200
+    assert res.get_json()["verified"] is False
@@ -0,0 +1,108 @@
+import io
+import json
+from unittest.mock import patch
+import pytest
+from routes.request_body import InvalidMoves, parse_json_body
+from tests.conftest import WON_GAME_1
+
+VERIFY_URL = "/api/verify"
+
+
+class CountingStream(io.BytesIO):
+    """Records how much of the body the parser actually read."""
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def parse(text: str, max_moves: int = 100000, chunk_size: int = 7):
+    with patch("routes.request_body.CHUNK_SIZE", chunk_size):
+        return parse_json_body(io.BytesIO(text.encode()), max_moves)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+def test_matches_json_loads_across_chunk_boundaries(chunk_size):
+    body = json.dumps({"seed": "abc", "moves": WON_GAME_1["moves"], "n": 12345, "x": {"a": [1, "b"]}}, indent=1)
+    assert parse(body, chunk_size=chunk_size) == json.loads(body)
+
+
+@pytest.mark.parametrize("body", [
+    '{"moves": []}',
+    ' { "seed" : 1 , "moves" : [ "up" , "left" ] } ',
+    '{"moves": ["\\u0075p", "down"]}',
+    '{"moves": "up"}',
+    '[1, 2]',
+    '{}',
+])
+def test_accepts_what_json_loads_accepts(body):
+    assert parse(body) == json.loads(body)
+
+
+@pytest.mark.parametrize("moves", ['["jump"]', '[1, 2]', '["up", null]', '["up", ["down"]]', '["UP"]'])
+def test_rejects_invalid_moves(moves):
+    with pytest.raises(InvalidMoves):
+        parse(f'{{"seed": "abc", "moves": {moves}}}')
+
+
+@pytest.mark.parametrize("body", ["", "{", '{"moves": ["up",]}', '{"seed": 1} x', '{"seed" 1}', '{1: 2}'])
+def test_malformed_json_raises_value_error(body):
+    with pytest.raises(ValueError):
+        parse(body)
+
+
+def test_stops_reading_at_first_invalid_move():
+    body = json.dumps({"seed": "abc", "moves": ["up", "jump"] + ["down"] * 100000}).encode()
+    stream = CountingStream(body)
+
+    with pytest.raises(InvalidMoves):
+        parse_json_body(stream, max_moves=100000)
+    assert stream.bytes_read < len(body) // 10
+
+
+def test_rejects_too_many_moves():
+    with pytest.raises(InvalidMoves, match="at most 3"):
+        parse('{"moves": ["up", "up", "up", "up"]}', max_moves=3)
+    assert parse('{"moves": ["up", "up", "up"]}', max_moves=3)["moves"] == ["up"] * 3
+
+
+def test_verify_rejects_invalid_move(client):
+    res = client.post(VERIFY_URL, json={"seed": "abc", "moves": ["up", "sideways"]})
+    assert res.status_code == 400
+    assert res.get_json()["message"] == "moves must be a list of: up, down, left, right"
+
+
+def test_verify_rejects_too_many_moves(app, client):
+    app.config["MAX_REPLAY_MOVES"] = 10
+    res = client.post(VERIFY_URL, json={"seed": "abc", "moves": ["up"] * 11})
+    assert res.status_code == 400
+
+
+def test_verify_rejects_oversized_body(app, client):
+    app.config["MAX_CONTENT_LENGTH"] = 1024
+    res = client.post(VERIFY_URL, json={"seed": "abc", "moves": ["left"] * 1000})
+    assert res.status_code == 413
+    assert res.get_json()["status"] == 413
+
+
+def test_verify_malformed_json_returns_400(client):
+    res = client.post(VERIFY_URL, data='{"seed": "abc", "moves": ["up"', content_type="application/json")
+    assert res.status_code == 400
+
+
+def test_verify_streams_large_body(client):
+    # Over one chunk, so parsed from the stream rather than read whole
+    moves = ["left", "right"] * 10000 + ["jump"]
+    res = client.post(VERIFY_URL, json={"seed": "abc", "moves": moves})
+    assert res.status_code == 400
+    assert res.get_json()["message"] == "moves must be a list of: up, down, left, right"
+
+
+def test_verify_large_body_matches_small_body_result(client):
+    res = client.post(VERIFY_URL, data=json.dumps(WON_GAME_1, indent=100), content_type="application/json")
+    assert res.status_code == 200
+    assert res.get_json()["wins"] == 1
@@ -0,0 +1,82 @@
+"""test_route_policy.py — cheap routes bypass session creation and the limiter."""
+import pytest
+from extensions import db, limiter
+from models.user import User
+
+VERIFY_URL = "/api/verify"
+STATS_URL = "/api/statistics"
+HEALTH_URL = "/healthz"
+
+_BODY = {"seed": "test-seed", "moves": []}
+_PREFLIGHT_HEADERS = {
+    "Origin": "http://localhost:3000",
+    "Access-Control-Request-Method": "POST",
+}
+
+
+def _user_count():
+    return db.session.query(User).count()
+
+
+# ===========================================================================
+# Session bypass
+# ===========================================================================
+
+def test_preflight_does_not_create_user(client):
+    res = client.options(VERIFY_URL, headers=_PREFLIGHT_HEADERS)
+
+    assert res.status_code == 200
+    assert _user_count() == 0
+    assert "Set-Cookie" not in res.headers
+
+
+def test_healthz_does_not_create_user(client):
+    res = client.get(HEALTH_URL)
+
+    assert res.status_code == 200
+    assert res.get_json() == {"status": "ok"}
+    assert _user_count() == 0
+
+
+def test_statistics_still_creates_session(client):
+    client.get(STATS_URL)
+    assert _user_count() == 1
+
+
+# ===========================================================================
+# Limiter bypass
+# ===========================================================================
+
+@pytest.fixture
+def fresh_limiter(limiter_client):
+    limiter.reset()
+    yield limiter_client
+
+
+def test_healthz_is_not_rate_limited(fresh_limiter):
+    statuses = [fresh_limiter.get(HEALTH_URL).status_code for _ in range(5)]
+    assert statuses == [200] * 5
+
+
+def test_preflight_does_not_consume_verify_limit(fresh_limiter):
+    for _ in range(3):
+        assert fresh_limiter.options(VERIFY_URL, headers=_PREFLIGHT_HEADERS).status_code == 200
+
+    res = fresh_limiter.post(VERIFY_URL, json=_BODY)
+    assert res.status_code == 200
+
+
+def test_statistics_with_session_is_not_rate_limited(fresh_limiter):
+    statuses = [fresh_limiter.get(STATS_URL).status_code for _ in range(5)]
+    assert statuses == [200] * 5
+    # Still a session route: polling keeps working for the same player
+    assert _user_count() == 1
+
+
+def test_statistics_without_session_is_rate_limited(fresh_limiter):
+    """Each cookieless request creates a User, so those stay under the default limit."""
+    cookieless = fresh_limiter.application.test_client(use_cookies=False)
+    statuses = [cookieless.get(STATS_URL).status_code for _ in range(4)]
+
+    assert statuses == [200, 200, 429, 429]
+    assert _user_count() == 2
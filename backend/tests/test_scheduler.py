@@ -7,8 +7,22 @@ from sqlalchemy.pool import StaticPool
 
 from app import create_app
 from extensions import db
+from models.game_record import GameRecord
+from models.idempotency_key import IdempotencyKey
+from models.seen_seed import SeenSeed
 from models.user import User
-from background import cleanup_expired_sessions
+from background import (
+    cleanup_expired_game_records,
+    cleanup_expired_idempotency_keys,
+    cleanup_expired_seen_seeds,
+    cleanup_expired_sessions,
+    claim_job_run,
+    elect_scheduler_leader,
+    job_lock,
+    run_cleanup_job,
+    run_leaderboard_job,
+    start_scheduler,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -86,3 +100,215 @@ def test_fresh_user_not_cleaned_up(app):
     user_exists = db.session.get(User, user_id)
     
     assert user_exists is not None, f"User was deleted! Total users in DB: {user_count}"
+
+
+# ---------------------------------------------------------------------------
+# Batched deletion
+# ---------------------------------------------------------------------------
+
+def test_cleanup_deletes_in_batches(app):
+    """Expired rows are removed in CLEANUP_BATCH_SIZE chunks until none remain."""
+    app.config.update(CLEANUP_BATCH_SIZE=2, CLEANUP_BATCH_PAUSE_SECONDS=0)
+    expired_ids = [_make_user(created_at=datetime.now() - timedelta(days=3 * 365)) for _ in range(5)]
+    fresh_id = _make_user(created_at=datetime.now())
+
+    stats = cleanup_expired_sessions(app, db)
+
+    assert stats["deleted"] == 5
+    assert stats["batches"] == 3
+    db.session.expire_all()
+    assert all(db.session.get(User, user_id) is None for user_id in expired_ids)
+    assert db.session.get(User, fresh_id) is not None
+
+
+def test_cleanup_with_nothing_expired_reports_zero(app):
+    _make_user(created_at=datetime.now())
+
+    stats = cleanup_expired_sessions(app, db)
+
+    assert stats["deleted"] == 0
+    assert stats["batches"] == 0
+
+
+def test_cleanup_expired_idempotency_keys(app):
+    app.config.update(CLEANUP_BATCH_SIZE=2, CLEANUP_BATCH_PAUSE_SECONDS=0, IDEMPOTENCY_TTL_SECONDS=3600)
+    for i in range(3):
+        db.session.add(IdempotencyKey(
+            key=f"old-{i}", status_code=200, body="{}", created_at=datetime.now() - timedelta(hours=2),
+        ))
+    db.session.add(IdempotencyKey(key="fresh", status_code=200, body="{}"))
+    db.session.commit()
+
+    assert cleanup_expired_idempotency_keys(app, db) == 3
+    assert [row.key for row in db.session.query(IdempotencyKey)] == ["fresh"]
+
+
+def test_cleanup_expired_seen_seeds(app):
+    old = SeenSeed.for_seed("user", "old-seed")
+    old.created_at = datetime.now() - timedelta(days=3 * 365)
+    db.session.add_all([old, SeenSeed.for_seed("user", "fresh-seed")])
+    db.session.commit()
+
+    assert cleanup_expired_seen_seeds(app, db) == 1
+    assert [row.seed_hash for row in db.session.query(SeenSeed)] == [SeenSeed.hash_seed("fresh-seed")]
+
+
+def test_cleanup_expired_game_records(app):
+    app.config.update(CLEANUP_BATCH_PAUSE_SECONDS=0, GAME_RECORD_RETENTION_DAYS=30)
+    for user_id, age in (("old", 31), ("fresh", 1)):
+        db.session.add(GameRecord(
+            user_id=user_id, seed="seed", result="Won", num_moves=1, moves=b"", verify_ms=1.0,
+            created_at=datetime.now() - timedelta(days=age),
+        ))
+    db.session.commit()
+
+    assert cleanup_expired_game_records(app, db) == 1
+    assert [row.user_id for row in db.session.query(GameRecord)] == ["fresh"]
+
+    app.config["GAME_RECORD_RETENTION_DAYS"] = 0
+    assert cleanup_expired_game_records(app, db) == 0
+
+
+def test_created_at_is_indexed():
+    assert any(
+        index.columns.keys() == ["created_at"] for index in User.__table__.indexes
+    )
+
+
+# ---------------------------------------------------------------------------
+# Single-leader coordination
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def locked_app(app, tmp_path):
+    app.config["SCHEDULER_LOCK_FILE"] = str(tmp_path / "cleanup.lock")
+    return app
+
+
+def test_job_lock_is_exclusive(locked_app):
+    with job_lock(locked_app, db) as first:
+        with job_lock(locked_app, db) as second:
+            assert first is True
+            assert second is False
+
+
+def test_job_lock_released_after_use(locked_app):
+    with job_lock(locked_app, db) as first:
+        assert first is True
+    with job_lock(locked_app, db) as again:
+        assert again is True
+
+
+def test_run_cleanup_job_skips_when_lock_held(locked_app):
+    user_id = _make_user(created_at=datetime.now() - timedelta(days=3 * 365))
+
+    with job_lock(locked_app, db):
+        assert run_cleanup_job(locked_app, db) is None
+
+    db.session.expire_all()
+    assert db.session.get(User, user_id) is not None
+
+
+def test_scheduler_leader_is_elected_once(locked_app):
+    leader = elect_scheduler_leader(locked_app, db)
+    try:
+        assert leader is not None
+        # Held for the leader's lifetime, not only while a job runs
+        assert elect_scheduler_leader(locked_app, db) is None
+    finally:
+        leader.close()
+    again = elect_scheduler_leader(locked_app, db)
+    assert again is not None
+    again.close()
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.jobs = []
+        self.started = False
+
+    def add_job(self, **kwargs):
+        self.jobs.append(kwargs)
+
+    def start(self):
+        self.started = True
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def test_scheduler_starts_jobs_now_in_leader_only(locked_app, monkeypatch):
+    schedulers = []
+
+    def make_scheduler():
+        schedulers.append(FakeScheduler())
+        return schedulers[-1]
+
+    monkeypatch.setattr("apscheduler.schedulers.background.BackgroundScheduler", make_scheduler)
+    start_scheduler(locked_app, db)
+    leader = locked_app.extensions["scheduler_leader"]
+    try:
+        # A second worker finds the leader lock taken and starts nothing
+        start_scheduler(locked_app, db)
+        assert locked_app.extensions["scheduler_leader"] is leader
+    finally:
+        locked_app.extensions.pop("scheduler_leader").close()
+
+    assert len(schedulers) == 1 and schedulers[0].started
+    # Both jobs also run at startup; their own checks skip them if they ran recently
+    assert all(job["next_run_time"] is not None for job in schedulers[0].jobs)
+
+
+def test_claim_job_run_once_per_interval(app):
+    assert claim_job_run(db, "job", 3600) is True
+    assert claim_job_run(db, "job", 3600) is False
+    assert claim_job_run(db, "other", 3600) is True
+    assert claim_job_run(db, "job", 0) is True
+
+
+def test_cleanup_runs_once_across_workers(locked_app):
+    """Two workers whose timers fire one after the other: only the first deletes."""
+    first_id = _make_user(created_at=datetime.now() - timedelta(days=3 * 365))
+    assert run_cleanup_job(locked_app, db)["deleted"] == 1
+
+    second_id = _make_user(created_at=datetime.now() - timedelta(days=3 * 365))
+    assert run_cleanup_job(locked_app, db) is None
+
+    db.session.expire_all()
+    assert db.session.get(User, first_id) is None
+    assert db.session.get(User, second_id) is not None
+    assert run_cleanup_job(locked_app, db, force=True)["deleted"] == 1
+
+
+def test_run_leaderboard_job_ranks_players(locked_app):
+    user_id = _make_user(created_at=datetime.now())
+    db.session.get(User, user_id).num_wins = 1
+    db.session.commit()
+
+    assert run_leaderboard_job(locked_app, db) == {"wins": 1, "win_rate": 0, "fastest_win": 0}
+
+
+def test_run_leaderboard_job_skips_fresh_boards(locked_app):
+    """A second worker (or a restarted leader) doesn't rebuild boards that are still fresh."""
+    assert run_leaderboard_job(locked_app, db) is not None
+    assert run_leaderboard_job(locked_app, db) is None
+
+    locked_app.config["LEADERBOARD_REFRESH_SECONDS"] = 0
+    assert run_leaderboard_job(locked_app, db) is not None
+
+
+def test_run_leaderboard_job_skips_when_lock_held(locked_app):
+    with job_lock(locked_app, db):
+        assert run_leaderboard_job(locked_app, db) is None
+
+
+def test_cleanup_cli_command_removes_expired(locked_app):
+    user_id = _make_user(created_at=datetime.now() - timedelta(days=3 * 365))
+
+    result = locked_app.test_cli_runner().invoke(args=["cleanup-sessions"])
+
+    assert result.exit_code == 0
+    assert "Removed 1 expired sessions" in result.output
+    assert "0 expired idempotency keys, 0 expired seen seeds and 0 expired game records" in result.output
+    db.session.expire_all()
+    assert db.session.get(User, user_id) is None
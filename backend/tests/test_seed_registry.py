@@ -0,0 +1,105 @@
+"""test_seed_registry.py — each seed is counted at most once per user."""
+import threading
+from unittest.mock import patch
+
+from app import create_app
+from extensions import db
+from models.seen_seed import SeenSeed
+from tests.conftest import ABANDONED_GAME_1, LOST_GAME_1, WON_GAME_2
+
+VERIFY_URL = "/api/verify"
+RESTART_URL = "/api/restart"
+IN_PROGRESS = {"seed": ABANDONED_GAME_1["seed"], "moves": ABANDONED_GAME_1["moves"][:4]}
+# Same seed, different body: not a retry, so the idempotency store does not answer it
+IN_PROGRESS_LONGER = {"seed": ABANDONED_GAME_1["seed"], "moves": ABANDONED_GAME_1["moves"]}
+
+
+def test_verified_seed_is_recorded(client):
+    client.post(VERIFY_URL, json=WON_GAME_2)
+    rows = db.session.query(SeenSeed).all()
+    assert len(rows) == 1
+    assert rows[0].seed_hash == SeenSeed.hash_seed(WON_GAME_2["seed"])
+
+
+def test_resubmitted_seed_is_not_counted_or_replayed(client):
+    client.post(RESTART_URL, json=IN_PROGRESS)
+    with patch("routes.solo.run_replay") as run_replay:
+        res = client.post(RESTART_URL, json=IN_PROGRESS_LONGER)
+
+    run_replay.assert_not_called()
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["verified"] is False
+    assert data["message"] == "Game already submitted"
+    assert data["abandoned"] == 1
+
+
+def test_abandoned_seed_cannot_then_be_verified(client):
+    client.post(RESTART_URL, json=IN_PROGRESS)
+    res = client.post(VERIFY_URL, json={"seed": ABANDONED_GAME_1["seed"], "moves": ABANDONED_GAME_1["moves"]})
+    assert res.get_json()["message"] == "Game already submitted"
+
+
+def test_rejected_restart_does_not_consume_seed(client):
+    res = client.post(RESTART_URL, json=LOST_GAME_1)
+    assert res.status_code == 400
+
+    res = client.post(VERIFY_URL, json=LOST_GAME_1)
+    assert res.get_json()["losses"] == 1
+
+
+def test_same_seed_counts_for_each_user(app, client):
+    client.post(VERIFY_URL, json=WON_GAME_2)
+    with app.test_client() as other_client:
+        res = other_client.post(VERIFY_URL, json=WON_GAME_2)
+    assert res.get_json()["wins"] == 1
+
+
+def test_concurrent_identical_submissions_count_once(tmp_path):
+    flask_app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'race.db'}",
+        "SECRET_KEY": "test-secret-key",
+    })
+    with flask_app.app_context():
+        db.create_all()
+    first = flask_app.test_client()
+    first.get("/api/statistics")
+    second = flask_app.test_client()
+    cookie_name = flask_app.config["SESSION_COOKIE_NAME"]
+    second.set_cookie(cookie_name, first.get_cookie(cookie_name).value)
+
+    # Both requests pass the duplicate check before either inserts its seed
+    both_checked = threading.Barrier(2)
+    seed_exists = SeenSeed.exists
+
+    def racing_exists(user_id, seed):
+        found = seed_exists(user_id, seed)
+        both_checked.wait(timeout=5)
+        return found
+
+    responses = []
+
+    def submit(client):
+        responses.append(client.post(VERIFY_URL, json=WON_GAME_2))
+
+    with patch.object(SeenSeed, "exists", side_effect=racing_exists):
+        threads = [threading.Thread(target=submit, args=(client,)) for client in (first, second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(res.status_code for res in responses) == [200, 200]
+    assert sorted(res.get_json().get("message", "") for res in responses) == ["", "Game already submitted"]
+    assert all(res.get_json()["wins"] == 1 for res in responses)
+    with flask_app.app_context():
+        assert db.session.query(SeenSeed).count() == 1
+
+
+def test_user_and_seed_are_unique_together():
+    assert any(
+        set(constraint.columns.keys()) == {"user_id", "seed_hash"}
+        for constraint in SeenSeed.__table__.constraints
+        if constraint.__class__.__name__ == "UniqueConstraint"
+    )
@@ -0,0 +1,94 @@
+"""test_slow_log.py — slow /api/verify and /api/restart calls are captured for offline replay."""
+import json
+import os
+
+import pytest
+
+from app import create_app
+from extensions import db
+from slow_log import process_log_path, read_slow_log
+from tests.conftest import WON_GAME_1
+
+VERIFY_URL = "/api/verify"
+
+
+@pytest.fixture
+def slow_log_path(tmp_path):
+    return str(tmp_path / "slow.jsonl")
+
+
+def _app_with_threshold(slow_log_path, threshold_ms):
+    return create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SECRET_KEY": "test-secret-key",
+        "SLOW_REQUEST_MS": threshold_ms,
+        "SLOW_REQUEST_LOG": slow_log_path,
+    })
+
+
+@pytest.fixture
+def capture_all_client(slow_log_path):
+    flask_app = _app_with_threshold(slow_log_path, threshold_ms=0.001)
+    with flask_app.app_context():
+        db.create_all()
+        with flask_app.test_client() as c:
+            yield c
+        db.drop_all()
+
+
+def test_slow_verify_is_captured_with_replay_payload(capture_all_client, slow_log_path):
+    capture_all_client.post(VERIFY_URL, json=WON_GAME_1)
+
+    (entry,) = read_slow_log(slow_log_path)
+    assert entry["endpoint"] == "verify_game"
+    assert entry["status"] == 200
+    assert entry["seed"] == WON_GAME_1["seed"]
+    assert entry["moves"] == WON_GAME_1["moves"]
+    assert entry["num_moves"] == len(WON_GAME_1["moves"])
+    assert entry["simulate_seconds"] > 0
+    assert entry["db_seconds"] > 0
+    assert entry["total_seconds"] >= entry["simulate_seconds"]
+
+
+def test_each_process_writes_its_own_file(capture_all_client, slow_log_path):
+    capture_all_client.post(VERIFY_URL, json=WON_GAME_1)
+
+    assert os.path.exists(process_log_path(slow_log_path))
+    assert not os.path.exists(slow_log_path)
+
+
+def test_read_slow_log_merges_worker_files(slow_log_path):
+    for pid, timestamp in [(222, "2026-01-02T00:00:00+00:00"), (111, "2026-01-01T00:00:00+00:00")]:
+        with open(process_log_path(slow_log_path, pid), "w") as f:
+            f.write(json.dumps({"timestamp": timestamp, "pid": pid}) + "\n")
+
+    assert [entry["pid"] for entry in read_slow_log(slow_log_path)] == [111, 222]
+
+
+def test_other_endpoints_not_captured(capture_all_client, slow_log_path):
+    capture_all_client.get("/api/statistics")
+
+    with pytest.raises(FileNotFoundError):
+        read_slow_log(slow_log_path)
+
+
+def test_fast_requests_not_captured(slow_log_path):
+    flask_app = _app_with_threshold(slow_log_path, threshold_ms=60_000)
+    with flask_app.app_context():
+        db.create_all()
+        flask_app.test_client().post(VERIFY_URL, json=WON_GAME_1)
+        db.drop_all()
+
+    with pytest.raises(FileNotFoundError):
+        read_slow_log(slow_log_path)
+
+
+def test_replay_slow_log_command(capture_all_client, slow_log_path):
+    capture_all_client.post(VERIFY_URL, json=WON_GAME_1)
+
+    result = capture_all_client.application.test_cli_runner().invoke(args=["replay-slow-log", slow_log_path])
+
+    assert result.exit_code == 0
+    assert f"seed={WON_GAME_1['seed']}" in result.output
+    assert "result=True/Won" in result.output
@@ -0,0 +1,79 @@
+"""test_startup.py — create_app does no DDL; `flask init-db` bootstraps the schema."""
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.pool import StaticPool
+
+from app import create_app
+from extensions import db
+
+
+@pytest.fixture
+def bare_app():
+    flask_app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_ENGINE_OPTIONS": {
+            "connect_args": {"check_same_thread": False},
+            "poolclass": StaticPool,
+        },
+        "SECRET_KEY": "test-secret-key",
+    })
+    with flask_app.app_context():
+        yield flask_app
+        db.drop_all()
+
+
+def test_create_app_does_not_create_tables(bare_app):
+    assert inspect(db.engine).get_table_names() == []
+
+
+def test_init_db_creates_tables_and_indexes(bare_app):
+    result = bare_app.test_cli_runner().invoke(args=["init-db"])
+
+    assert result.exit_code == 0
+    inspector = inspect(db.engine)
+    assert "user" in inspector.get_table_names()
+    assert any(index["column_names"] == ["created_at"] for index in inspector.get_indexes("user"))
+
+
+def test_init_db_is_idempotent(bare_app):
+    runner = bare_app.test_cli_runner()
+    runner.invoke(args=["init-db"])
+
+    result = runner.invoke(args=["init-db"])
+
+    assert result.exit_code == 0
+
+
+def test_replay_engine_imports_without_flask():
+    """Process-pool workers only need utils.replay; it must not drag in the web stack."""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, utils.replay; print('flask' in sys.modules)"],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_init_db_adds_new_nullable_columns(bare_app):
+    from sqlalchemy import text
+
+    with db.engine.begin() as conn:
+        # The user table as created before best_win_moves existed
+        conn.execute(text(
+            'CREATE TABLE "user" (user_id VARCHAR(36) PRIMARY KEY, num_wins INTEGER NOT NULL, '
+            "num_losses INTEGER NOT NULL, num_abandoned_games INTEGER NOT NULL, created_at DATETIME NOT NULL)"
+        ))
+
+    result = bare_app.test_cli_runner().invoke(args=["init-db"])
+
+    assert result.exit_code == 0
+    columns = {column["name"] for column in inspect(db.engine).get_columns("user")}
+    assert "best_win_moves" in columns
@@ -1,5 +1,6 @@
 import pytest
 import time
+from unittest.mock import patch
 from tests.conftest import WON_GAME_1, WON_GAME_2, LOST_GAME_1, LOST_GAME_2, ABANDONED_GAME_1, ABANDONED_GAME_2
 
 
@@ -112,3 +113,70 @@ def test_statistics_invalid_user_id_creates_new(client):
     assert data["losses"] == 0
     assert data["abandoned"] == 0
     assert data["user_id"] != "not-a-valid-uuid"
+
+
+def test_statistics_sets_etag(client):
+    res = client.get("/api/statistics")
+    user_id = res.get_json()["user_id"]
+
+    assert res.headers["ETag"] == f'"{user_id}.0"'
+    assert res.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_statistics_unchanged_poll_returns_304(client):
+    etag = client.get("/api/statistics").headers["ETag"]
+
+    res = client.get("/api/statistics", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.data == b""
+    assert res.headers["ETag"] == etag
+
+
+def test_statistics_304_skips_user_lookup(client):
+    from extensions import db
+    from models.user import User
+
+    res = client.get("/api/statistics")
+    user_id, etag = res.get_json()["user_id"], res.headers["ETag"]
+    # With the row gone, only the in-process version cache can answer
+    db.session.delete(db.session.get(User, user_id))
+    db.session.commit()
+
+    res = client.get("/api/statistics", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+
+def test_statistics_etag_changes_after_verify(client):
+    etag = client.get("/api/statistics").headers["ETag"]
+    client.post("/api/verify", json=WON_GAME_1)
+
+    res = client.get("/api/statistics", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.get_json()["wins"] == 1
+    assert res.headers["ETag"] != etag
+
+
+def test_statistics_etag_changes_after_restart(client):
+    etag = client.get("/api/statistics").headers["ETag"]
+    client.post("/api/restart", json={"seed": ABANDONED_GAME_1["seed"], "moves": ABANDONED_GAME_1["moves"][:5]})
+
+    res = client.get("/api/statistics", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.get_json()["abandoned"] == 1
+
+
+def test_statistics_other_users_etag_does_not_match(client):
+    etag = client.get("/api/statistics").headers["ETag"]
+    client.delete_cookie("session")
+
+    res = client.get("/api/statistics", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+
+def test_statistics_expired_version_still_revalidates(client):
+    etag = client.get("/api/statistics").headers["ETag"]
+
+    # Past the cache entry's expiry the row is loaded and compared instead
+    with patch("stats_cache.time.monotonic", return_value=time.monotonic() + 3600):
+        res = client.get("/api/statistics", headers={"If-None-Match": etag})
+    assert res.status_code == 304
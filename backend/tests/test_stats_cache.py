@@ -0,0 +1,43 @@
+from unittest.mock import patch
+from stats_cache import StatsVersionCache, stats_etag
+
+
+def test_etag_depends_on_user_and_version():
+    assert stats_etag("a", 1) != stats_etag("a", 2)
+    assert stats_etag("a", 1) != stats_etag("b", 1)
+
+
+def test_evicts_least_recently_used():
+    cache = StatsVersionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 1)
+    cache.get("a")
+    cache.put("c", 1)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+def test_put_replaces_version():
+    cache = StatsVersionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("a", 2)
+    assert cache.get("a") == 2
+
+
+def test_entries_expire():
+    cache = StatsVersionCache(max_entries=2, ttl_seconds=5)
+    with patch("stats_cache.time.monotonic", return_value=100.0):
+        cache.put("a", 1)
+    with patch("stats_cache.time.monotonic", return_value=104.0):
+        assert cache.get("a") == 1
+    with patch("stats_cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_zero_size_or_ttl_disables_cache():
+    for cache in (StatsVersionCache(max_entries=0, ttl_seconds=5), StatsVersionCache(max_entries=2, ttl_seconds=0)):
+        cache.put("a", 1)
+        assert cache.get("a") is None
@@ -158,8 +158,34 @@ def test_verify_user_not_found(client):
 # State logic
 # ===========================================================================
 
-def test_verify_same_won_game_twice_double_counts(client):
-    """The server performs no deduplication; submitting the same win twice → wins == 2."""
+def test_verify_same_won_game_twice_counts_once(client):
+    """A retried submission of the same win is answered from the replay cache → wins == 1."""
     client.post(VERIFY_URL, json=WON_GAME_2)
     res = client.post(VERIFY_URL, json=WON_GAME_2)
-    assert res.get_json()["wins"] == 2
+    assert res.status_code == 200
+    assert res.get_json()["wins"] == 1
+
+
+def test_verify_retry_does_not_replay_again(client):
+    from routes import solo
+
+    with patch("routes.solo.run_replay", wraps=solo.run_replay) as run_replay:
+        client.post(VERIFY_URL, json=WON_GAME_2)
+        client.post(VERIFY_URL, json=WON_GAME_2)
+    assert run_replay.call_count == 1
+
+
+def test_verify_retried_failure_counts_once(client):
+    tampered = {"seed": WON_GAME_2["seed"], "moves": ["up"] * 40}
+    client.post(VERIFY_URL, json=tampered)
+    res = client.post(VERIFY_URL, json=tampered)
+    data = res.get_json()
+    assert data["verified"] is False
+    assert data["abandoned"] == 1
+
+
+def test_verify_different_games_both_count(client):
+    client.post(VERIFY_URL, json=WON_GAME_2)
+    res = client.post(VERIFY_URL, json=LOST_GAME_1)
+    data = res.get_json()
+    assert (data["wins"], data["losses"]) == (1, 1)
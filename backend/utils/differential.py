@@ -0,0 +1,177 @@
+"""Differential fuzzing of the game engine.
+
+Runs random seeds and move sequences through the production engine and a
+candidate engine side by side, compares the board, valid moves and state after
+every step, and shrinks any divergence to a short reproducer. Engine rewrites
+should pass a long run of this before they replace utils.game.
+
+A candidate is a callable make_game(seed) returning a game with its opening
+tiles already generated and the Game interface (slide_*, generate_tiles,
+get_game, get_valid_moves, get_state). Pass it as "module:attribute":
+
+    cd backend
+    python -m utils.differential my_engine:make_game --games 20000 --workers 8
+
+The reproducer is printed as a {"seed", "moves"} replay, the same shape the
+/api/verify payload and the test fixtures use.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.game import DeterministicRNG, SPACE, construct_grid
+from utils.replay import NUM_COLS, NUM_ROWS, apply_move, construct_game
+
+DIRECTIONS = ["up", "down", "left", "right"]
+
+
+def reference_game(seed):
+    game = construct_game(construct_grid(NUM_ROWS, NUM_COLS, SPACE), DeterministicRNG(str(seed)))
+    game.generate_tiles()
+    return game
+
+
+def load_engine(spec: str):
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr or "make_game")
+
+
+def snapshot(game) -> tuple:
+    grid = tuple(tuple(row) for row in game.get_game())
+    return grid, tuple(sorted(game.get_valid_moves())), game.get_state()
+
+
+def trace(make_game, seed, moves: list[str]) -> list[tuple]:
+    """Snapshot the opening board and the board after each move.
+
+    Invalid moves are skipped rather than ending the trace, so both engines
+    must also agree on which moves they reject. The trace stops once the
+    game is over, since nothing after that can change the board. If the
+    engine raises, the trace ends with a ("raised", repr) entry at the step
+    where it did.
+    """
+    try:
+        game = make_game(seed)
+        snapshots = [snapshot(game)]
+    except Exception as e:
+        return [("raised", repr(e))]
+    for move in moves:
+        _, valid_moves, state = snapshots[-1]
+        if state != "In Progress":
+            break
+        try:
+            if move in valid_moves:
+                apply_move(game, move)
+                game.generate_tiles()
+            snapshots.append(snapshot(game))
+        except Exception as e:
+            snapshots.append(("raised", repr(e)))
+            break
+    return snapshots
+
+
+def first_divergence(candidate, seed, moves: list[str]) -> int | None:
+    """Index of the first differing snapshot (0 = opening board), or None."""
+    actual = trace(candidate, seed, moves)
+    expected = trace(reference_game, seed, moves)
+    for step, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            return step
+    if len(actual) != len(expected):
+        return min(len(actual), len(expected))
+    return None
+
+
+def minimize(candidate, seed, moves: list[str]) -> list[str]:
+    """Shrink a diverging move list while it still diverges."""
+    step = first_divergence(candidate, seed, moves)
+    if step is None:
+        return moves
+    moves = moves[:max(step, 0)]
+
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(moves) - 1, -1, -1):
+            shorter = moves[:i] + moves[i + 1:]
+            step = first_divergence(candidate, seed, shorter)
+            if step is not None:
+                moves = shorter[:step]
+                changed = True
+                break
+    return moves
+
+
+def random_case(rng: random.Random, max_moves: int) -> tuple[str, list[str]]:
+    seed = str(uuid.UUID(int=rng.getrandbits(128)))
+    moves = [rng.choice(DIRECTIONS) for _ in range(rng.randint(1, max_moves))]
+    return seed, moves
+
+
+def describe(candidate, seed, moves: list[str]) -> dict:
+    """The replay with the step where it diverges and both snapshots there.
+
+    step, expected and actual are None if the engines agree; a snapshot is
+    None when that engine's trace ended before the step.
+    """
+    step = first_divergence(candidate, seed, moves)
+    expected = actual = None
+    if step is not None:
+        expected_trace = trace(reference_game, seed, moves)
+        actual_trace = trace(candidate, seed, moves)
+        expected = expected_trace[step] if step < len(expected_trace) else None
+        actual = actual_trace[step] if step < len(actual_trace) else None
+    return {"seed": seed, "moves": moves, "step": step, "expected": expected, "actual": actual}
+
+
+def fuzz(candidate, games: int, max_moves: int = 300, fuzz_seed: int = 0) -> dict | None:
+    """Run games random cases; return the minimized first divergence, or None."""
+    rng = random.Random(fuzz_seed)
+    for _ in range(games):
+        seed, moves = random_case(rng, max_moves)
+        if first_divergence(candidate, seed, moves) is not None:
+            return describe(candidate, seed, minimize(candidate, seed, moves))
+    return None
+
+
+def _fuzz_worker(args) -> dict | None:
+    spec, games, max_moves, fuzz_seed = args
+    return fuzz(load_engine(spec), games, max_moves, fuzz_seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("candidate", help="module:attribute of the candidate make_game(seed)")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--max-moves", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0, help="fuzzer seed, for reproducible runs")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    per_worker = -(-args.games // args.workers)
+    jobs = [(args.candidate, per_worker, args.max_moves, args.seed * 1000 + i) for i in range(args.workers)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        divergences = [result for result in pool.map(_fuzz_worker, jobs) if result]
+    elapsed = time.perf_counter() - start
+
+    print(f"{per_worker * args.workers} games in {elapsed:.1f} s", file=sys.stderr)
+    if not divergences:
+        print("No divergence found", file=sys.stderr)
+        return
+    shortest = min(divergences, key=lambda result: len(result["moves"]))
+    print(json.dumps({"seed": shortest["seed"], "moves": shortest["moves"]}))
+    print(f"Diverges at step {shortest['step']}", file=sys.stderr)
+    for label in ("expected", "actual"):
+        print(f"{label}: {json.dumps(shortest[label])}", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Python/JS engine parity check.
+
+Replays a corpus of games recorded from the frontend engine by
+utils/parity_record.mjs and compares a digest of every step (board hash and
+RNG state) with the Python engine, stopping at the first divergence with a
+snapshot of both boards. Without --corpus it runs the recorder itself:
+
+    cd backend
+    python -m utils.parity --games 5000
+    python -m utils.parity --corpus ../parity_corpus.jsonl
+
+Exits non-zero on divergence.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from utils.game import DeterministicRNG, SPACE, construct_grid
+from utils.replay import NUM_COLS, NUM_ROWS, apply_move, construct_game
+
+RECORDER = os.path.join(os.path.dirname(__file__), "..", "..", "utils", "parity_record.mjs")
+MOVE_CODES = {"u": "up", "d": "down", "l": "left", "r": "right"}
+
+
+def board_key(grid) -> str:
+    return "/".join(",".join(str(cell) for cell in row) for row in grid)
+
+
+def digest(game) -> str:
+    board_hash = DeterministicRNG._hash_seed(board_key(game.get_game()))
+    return f"{board_hash:08x}:{game._rng._state:08x}"
+
+
+def digests(seed, moves: str):
+    """Yield the digest of the opening board and of the board after each move."""
+    game = construct_game(construct_grid(NUM_ROWS, NUM_COLS, SPACE), DeterministicRNG(str(seed)))
+    game.generate_tiles()
+    yield digest(game), game
+    for code in moves:
+        apply_move(game, MOVE_CODES[code])
+        game.generate_tiles()
+        yield digest(game), game
+
+
+def check_game(record: dict) -> dict | None:
+    """Return the first divergence for one recorded game, or None."""
+    previous = None
+    for step, ((actual, game), expected) in enumerate(zip(digests(record["seed"], record["moves"]), record["digests"])):
+        if actual != expected:
+            return {
+                "seed": record["seed"],
+                "moves": record["moves"][:step],
+                "step": step,
+                "expected": expected,
+                "actual": actual,
+                "python_board_before": previous,
+                "python_board": [list(row) for row in game.get_game()],
+            }
+        previous = [list(row) for row in game.get_game()]
+    return None
+
+
+def check_corpus(lines) -> tuple[int, int, dict | None]:
+    """Check recorded games until the first divergence: (games, steps, divergence)."""
+    games = steps = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        divergence = check_game(record)
+        games += 1
+        if divergence:
+            return games, steps + divergence["step"], divergence
+        steps += len(record["digests"])
+    return games, steps, None
+
+
+def record_js_boards(seed, moves: str) -> list[dict]:
+    output = subprocess.run(
+        ["node", RECORDER, "--seed", seed, "--moves", moves],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def format_board(grid) -> str:
+    return "\n".join("  " + "".join(f"{str(cell):>5}" for cell in row) for row in grid)
+
+
+def print_divergence(divergence: dict) -> None:
+    step = divergence["step"]
+    print(f"Divergence at step {step} for seed {divergence['seed']}")
+    print(f"  replay: {json.dumps({'seed': divergence['seed'], 'moves': [MOVE_CODES[c] for c in divergence['moves']]})}")
+    print(f"  digest (board hash:rng state)  js {divergence['expected']}  python {divergence['actual']}")
+    if divergence["python_board_before"] is not None:
+        print(f"\n  board before move {MOVE_CODES[divergence['moves'][-1]]!r} (both engines agree):")
+        print(format_board(divergence["python_board_before"]))
+    print("\n  python:")
+    print(format_board(divergence["python_board"]))
+    try:
+        js_board = record_js_boards(divergence["seed"], divergence["moves"])[step]["board"]
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"\n  (could not replay the JS side: {e})")
+        return
+    print("\n  js:")
+    print(format_board(js_board))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="JSON-lines file from parity_record.mjs (default: record now)")
+    parser.add_argument("--games", type=int, default=1000, help="games to record when no corpus is given")
+    parser.add_argument("--max-moves", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.corpus:
+        with open(args.corpus) as f:
+            games, steps, divergence = check_corpus(f)
+    else:
+        recorder = subprocess.Popen(
+            ["node", RECORDER, "--games", str(args.games), "--max-moves", str(args.max_moves)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            games, steps, divergence = check_corpus(recorder.stdout)
+        finally:
+            recorder.kill()
+        if recorder.wait() > 0:
+            sys.exit(f"parity_record.mjs exited with status {recorder.returncode}")
+    elapsed = time.perf_counter() - start
+
+    print(f"Checked {games} games, {steps} steps in {elapsed:.1f} s")
+    if divergence:
+        print_divergence(divergence)
+        sys.exit(1)
+    print("Python and JS engines agree")
+
+
+if __name__ == "__main__":
+    main()
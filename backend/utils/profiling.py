@@ -0,0 +1,137 @@
+"""Opt-in hot-path profiling for the game engine.
+
+Set ENGINE_PROFILE=1 to wrap the engine's hot functions with call counters and
+timers. Nothing is wrapped when the flag is off, so the engine runs unchanged.
+
+Timings are only collected inside profile_replay(), per replay, as folded
+call stacks ("Game.slide_left;collapse_list_left 1234" = microseconds of self
+time), which flamegraph tools accept directly. A fraction of replays
+(ENGINE_PROFILE_CPROFILE_RATE) can also run under cProfile.
+"""
+import contextvars
+import cProfile
+import functools
+import io
+import os
+import pstats
+import random
+import time
+from contextlib import contextmanager
+
+from utils import game
+
+ENABLED = os.getenv("ENGINE_PROFILE", "").lower() in {"1", "true", "yes"}
+SLOW_REPLAY_SECONDS = float(os.getenv("ENGINE_PROFILE_SLOW_MS", "250")) / 1000
+CPROFILE_RATE = float(os.getenv("ENGINE_PROFILE_CPROFILE_RATE", "0"))
+
+# (owner, attribute) pairs wrapped by install()
+HOT_PATHS = [
+    (game.Game, "slide_up"),
+    (game.Game, "slide_down"),
+    (game.Game, "slide_left"),
+    (game.Game, "slide_right"),
+    (game.Game, "get_valid_moves"),
+    (game.Game, "generate_tiles"),
+    (game.DeterministicRNG, "random"),
+    (game.DeterministicRNG, "choice"),
+    (game.DeterministicRNG, "sample"),
+    # Module-level: Game.left()/right()/up()/down() look these up as globals
+    (game, "collapse_list_left"),
+    (game, "collapse_list_right"),
+]
+
+# Per-replay collector: {"stack": [names], "folded": {path: [calls, seconds]}}
+_collector = contextvars.ContextVar("engine_profile_collector", default=None)
+_installed = False
+
+
+def _timed(name: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        collector = _collector.get()
+        if collector is None:
+            return func(*args, **kwargs)
+
+        stack = collector["stack"]
+        stack.append(name)
+        path = ";".join(stack)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            entry = collector["folded"].setdefault(path, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+    return wrapper
+
+
+def install() -> None:
+    global _installed
+    if _installed:
+        return
+    for owner, attr in HOT_PATHS:
+        func = getattr(owner, attr)
+        name = attr if owner is game else f"{owner.__name__}.{attr}"
+        setattr(owner, attr, _timed(name, func))
+    _installed = True
+
+
+def install_if_enabled() -> None:
+    if ENABLED:
+        install()
+
+
+@contextmanager
+def profile_replay(use_cprofile: bool | None = None):
+    """Collect engine timings for the enclosed replay into the yielded report dict.
+
+    After the block, report holds "seconds", "folded" ({path: (calls, seconds)})
+    and, when cProfile ran, "pstats" (text of the top functions by cumulative time).
+    """
+    if use_cprofile is None:
+        use_cprofile = CPROFILE_RATE > 0 and random.random() < CPROFILE_RATE
+
+    report = {}
+    collector = {"stack": [], "folded": {}}
+    token = _collector.set(collector)
+    profiler = cProfile.Profile() if use_cprofile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield report
+    finally:
+        if profiler:
+            profiler.disable()
+        report["seconds"] = time.perf_counter() - start
+        _collector.reset(token)
+        report["folded"] = {path: tuple(entry) for path, entry in collector["folded"].items()}
+        if profiler:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+            report["pstats"] = out.getvalue()
+
+
+def format_folded(report: dict) -> str:
+    """Folded-stack lines weighted by self time in microseconds, slowest first."""
+    self_seconds = {path: seconds for path, (_, seconds) in report["folded"].items()}
+    for path, (_, seconds) in report["folded"].items():
+        parent = path.rpartition(";")[0]
+        if parent in self_seconds:
+            self_seconds[parent] -= seconds
+    lines = sorted(self_seconds.items(), key=lambda item: item[1], reverse=True)
+    return "\n".join(f"{path} {max(0, round(seconds * 1e6))}" for path, seconds in lines)
+
+
+def format_summary(report: dict, top: int = 8) -> str:
+    """Calls and inclusive milliseconds per hot function, slowest first."""
+    totals = {}
+    for path, (calls, seconds) in report["folded"].items():
+        name = path.rsplit(";", 1)[-1]
+        entry = totals.setdefault(name, [0, 0.0])
+        entry[0] += calls
+        entry[1] += seconds
+    rows = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    return ", ".join(f"{name} {calls}x {seconds * 1000:.1f}ms" for name, (calls, seconds) in rows)
@@ -0,0 +1,76 @@
+# Flask-free replay helpers, importable by worker processes without the web stack
+from utils import profiling
+from utils.game import ADDITION, DeterministicRNG, Game, SPACE, SUBTRACTION, construct_grid
+
+profiling.install_if_enabled()
+
+NUM_ROWS = 6
+NUM_COLS = 7
+INCLUDED_OPERATIONS = [ADDITION, SUBTRACTION]
+OPERATOR_SPAWN_RATE = 0.67
+INCLUDED_DIGITS = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+GENERATED_TILES_PER_TURN = 2
+VALID_MOVES = {"up", "down", "left", "right"}
+
+
+def construct_game(grid, rng=None) -> Game:
+    return Game(
+        grid,
+        rng,
+        NUM_ROWS,
+        NUM_COLS,
+        INCLUDED_OPERATIONS,
+        OPERATOR_SPAWN_RATE,
+        INCLUDED_DIGITS,
+        GENERATED_TILES_PER_TURN,
+    )
+
+
+def apply_move(game: Game, move: str) -> None:
+    match move:
+        case "up":
+            game.slide_up()
+        case "down":
+            game.slide_down()
+        case "left":
+            game.slide_left()
+        case "right":
+            game.slide_right()
+
+def new_game(seed) -> Game:
+    game = construct_game(construct_grid(NUM_ROWS, NUM_COLS, SPACE), DeterministicRNG(str(seed)))
+    game.generate_tiles()
+    return game
+
+
+def opening_state(seed) -> tuple[tuple, int]:
+    """The opening board and the RNG state after its tiles were generated."""
+    game = new_game(seed)
+    return tuple(tuple(row) for row in game.get_game()), game._rng._state
+
+
+def restore_opening(opening: tuple[tuple, int]) -> Game:
+    grid, rng_state = opening
+    rng = DeterministicRNG("")
+    rng._state = rng_state
+    game = construct_game([list(row) for row in grid], rng)
+    # Row-major blanks: the same order generate_tiles leaves behind
+    game.update_blank_spaces()
+    return game
+
+
+def simulate_game(seed, moves: list[str], opening: tuple[tuple, int] | None = None) -> tuple[bool, str | None]:
+    game = restore_opening(opening) if opening is not None else new_game(seed)
+
+    for move in moves:
+        if game.get_state() != "In Progress":
+            return False, None
+
+        valid_moves = set(game.get_valid_moves())
+        if move not in valid_moves:
+            return False, None
+
+        apply_move(game, move)
+        game.generate_tiles()
+
+    return True, game.get_state()
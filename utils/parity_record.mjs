@@ -0,0 +1,121 @@
+#!/usr/bin/env node
+/**
+ * Parity recorder — JavaScript side.
+ *
+ * Plays games through the real frontend/utils/game.js and writes one JSON line
+ * per game with a digest of every step, for backend/utils/parity.py to check
+ * the Python engine against:
+ *
+ *     node utils/parity_record.mjs --games 5000 > parity_corpus.jsonl
+ *     cd backend && python -m utils.parity --corpus ../parity_corpus.jsonl
+ *
+ * (python -m utils.parity without --corpus runs this script itself.)
+ *
+ * Output line:
+ *     {"seed": "...", "moves": "ulrd...", "digests": ["<board hash>:<rng state>", ...]}
+ * digests[0] is the opening board, digests[i] the board after move i and its
+ * spawned tiles. Moves are u/d/l/r, always chosen from the valid moves.
+ *
+ * With --seed and --moves it instead prints the full board after each step,
+ * which parity.py uses to show the JS side of a divergence.
+ */
+
+import { randomUUID } from "node:crypto";
+import { Game, constructGrid, SPACE, ADDITION, SUBTRACTION } from "../frontend/utils/game.js";
+
+const NUM_ROWS  = 6;
+const NUM_COLS  = 7;
+const OPS       = [ADDITION, SUBTRACTION];
+const OP_RATE   = 0.67;
+const DIGITS    = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9];
+const TILES_PER = 2;
+
+const MOVE_CODES = { u: "up", d: "down", l: "left", r: "right" };
+const encoder = new TextEncoder();
+
+
+// Same FNV-1a as DeterministicRNG's seed hash, so Python can reuse it
+function fnv1a(text) {
+    let hash = 0x811c9dc5;
+    for (const b of encoder.encode(text)) {
+        hash ^= b;
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return hash >>> 0;
+}
+
+function hex32(value) {
+    return (value >>> 0).toString(16).padStart(8, "0");
+}
+
+function boardKey(grid) {
+    return grid.map(row => row.map(String).join(",")).join("/");
+}
+
+function digest(game) {
+    return `${hex32(fnv1a(boardKey(game.getGame())))}:${hex32(game._rng._state)}`;
+}
+
+function newGame(seed) {
+    const game = new Game(
+        constructGrid(NUM_ROWS, NUM_COLS, SPACE),
+        NUM_ROWS, NUM_COLS,
+        OPS, OP_RATE, DIGITS, TILES_PER,
+        seed,
+    );
+    game.generateTiles();
+    return game;
+}
+
+function applyMove(game, move) {
+    switch (move) {
+        case "up":    game.slideUp();    break;
+        case "down":  game.slideDown();  break;
+        case "left":  game.slideLeft();  break;
+        case "right": game.slideRight(); break;
+    }
+    game.generateTiles();
+}
+
+function recordGame(seed, maxMoves) {
+    const game = newGame(seed);
+    // Move choice only needs to be varied, not reproducible: the moves are recorded
+    let moves = "";
+    const digests = [digest(game)];
+
+    while (moves.length < maxMoves && game.getState() === "In Progress") {
+        const valid = game.getValidMoves();
+        const move = valid[Math.floor(Math.random() * valid.length)];
+        applyMove(game, move);
+        moves += move[0];
+        digests.push(digest(game));
+    }
+    return { seed, moves, digests };
+}
+
+function dumpBoards(seed, moves) {
+    const game = newGame(seed);
+    process.stdout.write(JSON.stringify({ step: 0, board: game.getGame(), digest: digest(game) }) + "\n");
+    [...moves].forEach((code, i) => {
+        applyMove(game, MOVE_CODES[code]);
+        process.stdout.write(JSON.stringify({ step: i + 1, board: game.getGame(), digest: digest(game) }) + "\n");
+    });
+}
+
+
+// ── Main ────────────────────────────────────────────────────────────────────
+const args = process.argv.slice(2);
+function option(name, fallback) {
+    const index = args.indexOf(`--${name}`);
+    return index === -1 ? fallback : args[index + 1];
+}
+
+if (option("seed") !== undefined) {
+    dumpBoards(option("seed"), option("moves", ""));
+} else {
+    const games = Number(option("games", "1000"));
+    const maxMoves = Number(option("max-moves", "500"));
+    for (let i = 0; i < games; i++) {
+        process.stdout.write(JSON.stringify(recordGame(randomUUID(), maxMoves)) + "\n");
+    }
+}